@@ -1,11 +1,21 @@
 import streamlit as st
 import os
 import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as StageTimeout
 from datetime import datetime
-from ask_rag import ask_rag
-from retriever.search_index import search_index
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from ask_rag import ask_rag_stream
+from retriever.search_index import search_with_filters, link_sleeper_players
+from retriever.query_router import route_query
+from retriever.canned_questions import EXAMPLE_QUESTIONS, SUGGESTIONS
+from retriever.precomputed_answers import get_precomputed_answer
 from sleeper.league_manager import SleeperLeagueManager
 
+logger = logging.getLogger(__name__)
+
 # Page config
 st.set_page_config(
     page_title="Fantasy Football Advisor",
@@ -21,6 +31,69 @@ def get_sleeper_manager():
 
 sleeper_manager = get_sleeper_manager()
 
+# Matches the rosters TTL of the Sleeper response cache
+@st.cache_data(ttl=15 * 60, show_spinner=False)
+def load_league_details(league_id, user_id):
+    # Only the selected league's rosters and draft are fetched, then kept across reruns
+    return sleeper_manager.get_league_details(league_id, user_id)
+
+# Per-stage time budgets (seconds) for the concurrent query pipeline
+RETRIEVAL_TIMEOUT = float(os.getenv("RETRIEVAL_TIMEOUT", "15"))
+ROSTER_CONTEXT_TIMEOUT = float(os.getenv("ROSTER_CONTEXT_TIMEOUT", "8"))
+
+@st.cache_resource
+def get_query_executor():
+    # Shared by every session; each question uses at most two workers
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="query")
+
+def run_stage(fn, *args):
+    """Run fn on the query pool with this session's Streamlit context attached."""
+    ctx = get_script_run_ctx()
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+    return get_query_executor().submit(run)
+
+def stage_result(future, deadline, default):
+    """Wait for a stage until the shared deadline; on timeout or failure return default."""
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except StageTimeout:
+        return default
+    except Exception as e:
+        # A failed stage degrades the answer the same way a slow one does
+        logger.error(f"Query stage failed: {str(e)}")
+        return default
+
+def retrieve_context(query, top_k):
+    return search_with_filters(query, top_k=top_k)
+
+def link_league_players():
+    """Let questions that name players map to Sleeper ids as well.
+
+    Runs when a league is loaded, before any query stage starts. The player
+    store returns the same dict until its next refresh, so this is a no-op on
+    later reruns and only rebuilds the name resolver when Sleeper data changes.
+    """
+    try:
+        link_sleeper_players(sleeper_manager.players.fantasy_players())
+    except Exception as e:
+        logger.error(f"Could not link Sleeper players: {str(e)}")
+
+def build_roster_context(league):
+    roster_players = sleeper_manager.get_roster_players(
+        league["league_id"],
+        league["user_roster"],
+        include_draft_info=True
+    )
+    
+    return "\nYour roster and draft positions:\n" + "\n".join(
+        f"- {p['full_name']} ({p['position']} - {p['team']})" +
+        (f" [Drafted: Round {p['draft_info']['round']}, Pick {p['draft_info']['pick']}]"
+         if p.get('draft_info') else "")
+        for p in roster_players
+    )
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -76,8 +149,13 @@ with st.sidebar:
     st.subheader("🛏️ Sleeper Integration")
     sleeper_username = st.text_input("Enter your Sleeper username:")
     
+    # Sleeper responses are cached on disk; this forces the next reads to go to Sleeper
+    if st.button("🔄 Refresh Sleeper data"):
+        sleeper_manager.api.invalidate()
+        load_league_details.clear()
+    
     if sleeper_username:
-        leagues_info = sleeper_manager.get_user_leagues_info(sleeper_username)
+        leagues_info = sleeper_manager.get_user_league_summaries(sleeper_username)
         
         if "error" in leagues_info:
             st.error(leagues_info["error"])
@@ -115,8 +193,17 @@ with st.sidebar:
                                 )
                                 
                                 if selected_league:
-                                    st.session_state.selected_league = selected_league
-                                    st.session_state.user_id = leagues_info["user_id"]
+                                    with st.spinner("Loading league details..."):
+                                        league_details = load_league_details(
+                                            selected_league["league_id"], leagues_info["user_id"]
+                                        )
+                                    if league_details:
+                                        st.session_state.selected_league = league_details
+                                        st.session_state.user_id = leagues_info["user_id"]
+                                        link_league_players()
+                                    else:
+                                        st.session_state.pop("selected_league", None)
+                                        st.warning("You don't have a roster in this league")
                     except Exception as e:
                         st.error(f"Error processing league seasons: {str(e)}")
 
@@ -131,13 +218,7 @@ with tab_general:
     
     # Example questions
     st.subheader("Quick Questions")
-    example_questions = [
-        "Who are the top 5 running backs for PPR leagues?",
-        "Which rookie wide receivers should I target in the draft?",
-        "Who are the best sleeper picks this season?",
-        "Compare Justin Jefferson vs Ja'Marr Chase for this season",
-        "What's the best draft strategy for the 1st round?",
-    ]
+    example_questions = EXAMPLE_QUESTIONS
     
     col1, col2 = st.columns(2)
     with col1:
@@ -157,29 +238,40 @@ with tab_general:
                            help="Ask about players, draft strategy, trades, or general fantasy advice")
     
     if question:
-        with st.spinner("Searching fantasy football data..."):
-            # Get relevant context from vector search
-            search_results = search_index(question, top_k=5)
+        precomputed = get_precomputed_answer(question)
+        if precomputed:
+            # Canned questions are answered ahead of time after each data rebuild
+            st.markdown("### Answer")
+            st.write(precomputed["answer"])
             
-            if search_results:
-                # Get RAG response using the search results as context
-                with st.spinner("Analyzing context and generating answer..."):
-                    response = ask_rag(question, search_results)
-                    
-                    # Display the response in a clean format
+            with st.expander("View Source Data"):
+                for idx, source in enumerate(precomputed["sources"], 1):
+                    st.markdown(f"**Source {idx}:**")
+                    st.json(source)
+            
+            st.markdown("---")
+        else:
+            with st.spinner("Searching fantasy football data..."):
+                # Get relevant context from vector search, scoped to any positions or
+                # rookie status the question names (relaxed one filter at a time if nothing matches)
+                route = route_query(question)
+                search_results = search_with_filters(question, top_k=route.top_k)
+            
+                if search_results:
+                    # Stream the RAG response as it is generated, using the search results as context
                     st.markdown("### Answer")
-                    st.write(response)
-                    
+                    st.write_stream(ask_rag_stream(question, search_results, route))
+                
                     # Optionally show the sources used
                     with st.expander("View Source Data"):
                         for idx, result in enumerate(search_results, 1):
                             st.markdown(f"**Source {idx}:**")
-                            st.markdown(result, unsafe_allow_html=True)
-                    
+                            st.json(result._asdict())
+                
                     # Add a divider
                     st.markdown("---")
-            else:
-                st.error("No relevant information found in our database. Try asking about specific players, teams, or fantasy strategies.")
+                else:
+                    st.error("No relevant information found in our database. Try asking about specific players, teams, or fantasy strategies.")
 
 with tab_personal:
     st.header("Personal League Analysis")
@@ -216,7 +308,7 @@ if "selected_league" in st.session_state:
         
         with col2:
             st.subheader("Current Roster")
-            roster_players = sleeper_manager.get_roster_players(league["user_roster"])
+            roster_players = sleeper_manager.get_roster_players(league["league_id"], league["user_roster"])
             for player in roster_players:
                 with st.container():
                     st.markdown(
@@ -263,6 +355,7 @@ if "selected_league" in st.session_state:
         if league.get("draft_info"):
             st.write("### 📝 Draft History")
             draft_picks = sleeper_manager.get_roster_players(
+                league["league_id"],
                 league["user_roster"],
                 include_draft_info=True
             )
@@ -305,14 +398,11 @@ if "selected_league" in st.session_state:
 st.subheader("Quick Questions")
 col1, col2, col3 = st.columns(3)
 
-suggestions = {
-    "Analyze Keepers": "Who are my best keeper options based on draft position and current rankings?",
-    "Compare Players": "Compare my current roster players for keeper value",
-    "Draft Strategy": "What should my draft strategy be based on my keepers?",
-}
+suggestions = dict(SUGGESTIONS)
 
 if "selected_league" in st.session_state:
     roster_players = sleeper_manager.get_roster_players(
+        st.session_state.selected_league["league_id"],
         st.session_state.selected_league["user_roster"]
     )
     if roster_players:
@@ -334,36 +424,47 @@ query = st.text_input(
 if query:
     with st.spinner("🔄 Analyzing..."):
         try:
-            # Get context
-            context_chunks = search_index(query)
+            # Canned questions are answered ahead of time; with a league selected they need the roster
+            precomputed = None if "selected_league" in st.session_state else get_precomputed_answer(query)
+            if precomputed:
+                context_chunks = precomputed["sources"]
+                st.markdown("### 🤖 Analysis")
+                answer = precomputed["answer"]
+                st.markdown(answer)
+            else:
+                # Retrieval and roster context run concurrently; generation starts once both are in
+                start = time.monotonic()
+                route = route_query(query)
+                retrieval = run_stage(retrieve_context, query, route.top_k)
+                roster = None
+                if "selected_league" in st.session_state:
+                    roster = run_stage(build_roster_context, st.session_state.selected_league)
             
-            # Add roster and draft context if available
-            if "selected_league" in st.session_state:
-                league = st.session_state.selected_league
-                roster_players = sleeper_manager.get_roster_players(
-                    league["user_roster"],
-                    include_draft_info=True
-                )
-                
-                roster_context = "\nYour roster and draft positions:\n" + "\n".join(
-                    f"- {p['full_name']} ({p['position']} - {p['team']})" +
-                    (f" [Drafted: Round {p['draft_info']['round']}, Pick {p['draft_info']['pick']}]"
-                     if p.get('draft_info') else "")
-                    for p in roster_players
-                )
-                context_chunks.append(roster_context)
+                context_chunks = stage_result(retrieval, start + RETRIEVAL_TIMEOUT, None)
+                if context_chunks is None:
+                    st.warning("⚠️ Searching the rankings failed or took too long; answering without them")
+                    context_chunks = []
             
-            # Get answer
-            answer = ask_rag(query, context_chunks)
+                # Add roster and draft context if available
+                if roster is not None:
+                    roster_context = stage_result(roster, start + ROSTER_CONTEXT_TIMEOUT, None)
+                    if roster_context is None:
+                        st.warning("⚠️ Sleeper failed or did not respond in time; answering without your roster")
+                    else:
+                        context_chunks.append(roster_context)
             
-            # Display answer
-            st.markdown("### 🤖 Analysis")
-            st.markdown(answer)
+                # Stream the answer as it is generated; write_stream returns the full text
+                st.markdown("### 🤖 Analysis")
+                answer = st.write_stream(ask_rag_stream(query, context_chunks, route))
             
             # Display context if enabled
             with st.expander("📚 Context Used", expanded=False):
                 for i, chunk in enumerate(context_chunks, 1):
-                    st.markdown(f"**Source {i}:** {chunk}")
+                    if hasattr(chunk, "_asdict") or isinstance(chunk, dict):
+                        st.markdown(f"**Source {i}:**")
+                        st.json(chunk._asdict() if hasattr(chunk, "_asdict") else chunk)
+                    else:
+                        st.markdown(f"**Source {i}:** {chunk}")
             
             # Save to history
             if "history" not in st.session_state:
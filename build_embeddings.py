@@ -1,49 +1,62 @@
-import json
-import numpy as np
-from transformers import AutoTokenizer, AutoModel
-import torch
-import pickle
+import argparse
 import os
-from pathlib import Path
-from tqdm import tqdm
-
-# Input and output paths
-VECTOR_JSON_PATH = "scrape/data/all_weekly_rankings_vectors.json"
-EMBEDDINGS_PATH = "data/fantasy_embeddings.npy"
-METADATA_PATH = "data/fantasy_metadata.pkl"
-
-def get_embeddings(texts, model, tokenizer):
-    embeddings = []
-    for text in tqdm(texts, desc="Creating embeddings"):
-        inputs = tokenizer(text, padding=True, truncation=True, return_tensors="pt")
-        with torch.no_grad():
-            outputs = model(**inputs)
-            embedding = outputs.last_hidden_state.mean(dim=1).numpy()[0]
-            embeddings.append(embedding)
-    return np.array(embeddings)
-
-# Load vector data
-with open(VECTOR_JSON_PATH, "r", encoding="utf-8") as f:
-    data = json.load(f)
-
-# Extract metadata and text for encoding
-texts = [item["text"] for item in data]
-metadata = [item["metadata"] for item in data]
-
-# Initialize model and tokenizer
-model_name = 'sentence-transformers/all-MiniLM-L6-v2'
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModel.from_pretrained(model_name)
-
-# Create embeddings
-embeddings = get_embeddings(texts, model, tokenizer)
+from concurrent.futures import ProcessPoolExecutor
 
-# Save embeddings and metadata
-os.makedirs("data", exist_ok=True)
-np.save(EMBEDDINGS_PATH, embeddings)
+import numpy as np
 
-with open(METADATA_PATH, "wb") as f:
-    pickle.dump(metadata, f)
+from retriever.embeddings import LocalEmbeddingProvider
+from retriever.vector_store import VectorStore, write_vector_store, store_path_for_model
 
-print(f"✅ Saved embeddings to: {EMBEDDINGS_PATH}")
-print(f"✅ Saved metadata to: {METADATA_PATH}")
+# Input and output paths: texts come from the OpenAI vector store built by
+# retriever/vectorize_with_gpt4.py, output is a vector store for the local model
+SOURCE_MODEL = "text-embedding-ada-002"
+model_name = 'sentence-transformers/all-MiniLM-L6-v2'
+SOURCE_STORE_PATH = store_path_for_model(SOURCE_MODEL)
+OUTPUT_STORE_PATH = store_path_for_model(model_name)
+
+def _init_worker(threads):
+    import torch
+    # Split the cores between workers instead of letting each one claim all of them
+    torch.set_num_threads(threads)
+
+def _encode_shard(texts, batch_size):
+    return LocalEmbeddingProvider(model_name).embed(texts, batch_size=batch_size)
+
+def get_embeddings(texts, batch_size=64, workers=1):
+    """Encode texts with the local model, optionally sharded across worker processes."""
+    if workers <= 1 or len(texts) < workers * batch_size:
+        return LocalEmbeddingProvider(model_name).embed(texts, batch_size=batch_size, show_progress=True)
+
+    shards = [list(shard) for shard in np.array_split(np.array(texts, dtype=object), workers)]
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"Encoding {len(texts)} texts in {workers} worker processes ({threads} threads each)")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(threads,)) as executor:
+        results = list(executor.map(_encode_shard, shards, [batch_size] * len(shards)))
+    return np.vstack(results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local MiniLM vector store.")
+    parser.add_argument("--batch-size", type=int, default=64, help="Texts per forward pass")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes to shard encoding across")
+    args = parser.parse_args()
+
+    # Load source texts and metadata
+    source = VectorStore(SOURCE_STORE_PATH)
+
+    # Extract metadata and text for encoding
+    texts = source.columns["text"].tolist()
+    text_hashes = source.columns["text_hash"].tolist()
+    metadata = [source.record(i)._asdict() for i in range(len(source))]
+
+    # Create embeddings
+    embeddings = get_embeddings(texts, batch_size=args.batch_size, workers=args.workers)
+
+    # Save embeddings and metadata
+    write_vector_store(OUTPUT_STORE_PATH, embeddings, metadata, texts, text_hashes, model_name)
+
+    print(f"✅ Saved vector store to: {OUTPUT_STORE_PATH}")
+
+    # Re-warm the canned questions if this is the store the app searches (EMBEDDING_PROVIDER=local).
+    # Imported here so the encoding worker processes never load the OpenAI client
+    from retriever.precomputed_answers import precompute_answers
+    print(f"✅ Precomputed {precompute_answers()} answers")
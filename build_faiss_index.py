@@ -1,37 +1,35 @@
-import json
-import numpy as np
-import faiss
-import pickle
-import os
-
-# Input and output paths
-VECTOR_JSON_PATH = "scrape/data/all_weekly_rankings_vectors.json"  # adjust if needed
-FAISS_INDEX_PATH = "data/fantasy_index.faiss"
-METADATA_PATH = "data/fantasy_metadata.pkl"
-
-# Load vector data
-with open(VECTOR_JSON_PATH, "r", encoding="utf-8") as f:
-    data = json.load(f)
-
-# Extract vectors and metadata
-vectors = np.array([item["vector"] for item in data]).astype("float32")
-metadata = [item["metadata"] for item in data]
-
-# Normalize vectors for cosine similarity
-faiss.normalize_L2(vectors)
-
-# Create and populate FAISS index
-dim = vectors.shape[1]
-index = faiss.IndexFlatIP(dim)
-index.add(vectors)
-
-# Save the index
-os.makedirs("data", exist_ok=True)
-faiss.write_index(index, FAISS_INDEX_PATH)
-
-# Save metadata
-with open(METADATA_PATH, "wb") as f:
-    pickle.dump(metadata, f)
-
-print(f"✅ Saved FAISS index to: {FAISS_INDEX_PATH}")
-print(f"✅ Saved metadata to: {METADATA_PATH}")
+import argparse
+
+from retriever.ann_index import INDEX_TYPES, build_ann_index, save_ann_index, recall_latency_report
+from retriever.vector_store import VectorStore, store_path_for_model
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build FAISS indexes over a vector store.")
+    parser.add_argument("--model", default="text-embedding-ada-002",
+                        help="Embedding model whose vector store to index")
+    parser.add_argument("--index-type", choices=INDEX_TYPES + ("all",), default="flat",
+                        help="Index type to build")
+    parser.add_argument("--nlist", type=int, default=None, help="IVF list count (default ~4*sqrt(n))")
+    parser.add_argument("--hnsw-m", type=int, default=32, help="HNSW neighbors per node")
+    parser.add_argument("--report", action="store_true",
+                        help="Print recall@k against the flat index and p50/p99 latency")
+    parser.add_argument("--k", type=int, default=5, help="k for the recall report")
+    args = parser.parse_args()
+
+    # Input and output paths
+    store_path = store_path_for_model(args.model)
+    store = VectorStore(store_path)
+    index_types = INDEX_TYPES if args.index_type == "all" else (args.index_type,)
+
+    # Create, populate and save each index next to the vectors it was built from
+    for index_type in index_types:
+        index = build_ann_index(store.vectors, index_type, nlist=args.nlist, hnsw_m=args.hnsw_m)
+        path = save_ann_index(index, store, index_type)
+        print(f"✅ Saved {index_type} FAISS index to: {path}")
+
+    if args.report:
+        print(f"\n📊 Recall@{args.k} vs flat and per-query latency ({len(store)} vectors)")
+        print(f"{'index':<8}{'recall':>10}{'p50 ms':>10}{'p99 ms':>10}{'build s':>10}")
+        for row in recall_latency_report(store, INDEX_TYPES, k=args.k, nlist=args.nlist, hnsw_m=args.hnsw_m):
+            print(f"{row['index_type']:<8}{row['recall_at_k']:>10.3f}{row['p50_ms']:>10.3f}"
+                  f"{row['p99_ms']:>10.3f}{row['build_seconds']:>10.2f}")
@@ -0,0 +1,25 @@
+import argparse
+
+import numpy as np
+
+from retriever.quantization import QUANTIZATION_MODES, build_quantized_codes
+from retriever.vector_store import VectorStore, store_path_for_model
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build int8 or product-quantized codes for a vector store.")
+    parser.add_argument("--model", default="text-embedding-ada-002",
+                        help="Embedding model whose vector store to quantize")
+    parser.add_argument("--mode", choices=QUANTIZATION_MODES + ("all",), default="int8",
+                        help="Quantization mode to build")
+    args = parser.parse_args()
+
+    # Input and output paths
+    store_path = store_path_for_model(args.model)
+    store = VectorStore(store_path)
+    modes = QUANTIZATION_MODES if args.mode == "all" else (args.mode,)
+
+    for mode in modes:
+        codes_path = build_quantized_codes(store, mode)
+        codes = np.load(codes_path, mmap_mode="r")
+        print(f"✅ Saved {mode} codes to: {codes_path} "
+              f"({codes.nbytes / 1024:.0f} KiB vs {store.vectors.nbytes / 1024:.0f} KiB float32)")
@@ -1,4 +1,24 @@
-from .search_index import search_index, get_openai_client
-from .ask_rag import ask_rag
+from .search_index import (
+    search_index,
+    search_many,
+    search_with_filters,
+    infer_filters,
+    resolve_players,
+    link_sleeper_players,
+    get_openai_client,
+)
+from .ask_rag import ask_rag, ask_rag_stream
+from .query_router import route_query
 
-__all__ = ['search_index', 'get_openai_client', 'ask_rag']
\ No newline at end of file
+__all__ = [
+    'search_index',
+    'search_many',
+    'search_with_filters',
+    'infer_filters',
+    'resolve_players',
+    'link_sleeper_players',
+    'get_openai_client',
+    'ask_rag',
+    'ask_rag_stream',
+    'route_query',
+]
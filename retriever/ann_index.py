@@ -0,0 +1,193 @@
+import os
+import time
+import logging
+import threading
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # faiss is optional; without it search stays on the exact numpy path
+    faiss = None
+
+from .vector_store import BuildStamp, store_path_for_model, write_build_stamp
+
+__all__ = [
+    'INDEX_TYPES',
+    'AnnIndex',
+    'build_ann_index',
+    'save_ann_index',
+    'get_ann_index',
+    'index_path',
+    'recall_latency_report',
+]
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+IVF_NPROBE = int(os.getenv("IVF_NPROBE", "8"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "64"))
+
+
+def index_path(store_directory, index_type):
+    """Path of a FAISS index file, kept next to the vectors it was built from."""
+    return Path(store_directory) / f"index_{index_type}.faiss"
+
+
+def _stamp_path(index_file):
+    return index_file.with_suffix(".json")
+
+
+def _require_faiss():
+    if faiss is None:
+        raise ImportError("faiss is not installed; install faiss-cpu to build or use ANN indexes")
+
+
+def build_ann_index(vectors, index_type="flat", nlist=None, hnsw_m=32):
+    """Build a FAISS inner-product index of the given type from row-normalized vectors."""
+    _require_faiss()
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(dim)
+    elif index_type == "ivf":
+        # Rule of thumb is ~4*sqrt(n) lists, but FAISS wants ~39 training points per list
+        nlist = nlist or max(1, min(int(4 * np.sqrt(n)), n // 39))
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 2 * hnsw_m
+    else:
+        raise ValueError(f"Unknown index type '{index_type}'. Choose one of: {', '.join(INDEX_TYPES)}")
+
+    index.add(vectors)
+    return index
+
+
+def save_ann_index(index, store, index_type):
+    """Write an index next to its store, stamped with the store build it indexes."""
+    _require_faiss()
+    path = index_path(store.directory, index_type)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    faiss.write_index(index, str(tmp_path))
+    os.replace(tmp_path, path)
+    # Stamp last: until it matches the store, readers keep using exact search
+    write_build_stamp(_stamp_path(path), store)
+    return path
+
+
+def _configure_search(index, index_type):
+    if index_type == "ivf":
+        index.nprobe = IVF_NPROBE
+    elif index_type == "hnsw":
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+
+
+class AnnIndex:
+    """A FAISS index file built from a vector store, reloaded when the file changes."""
+
+    def __init__(self, store_directory, index_type):
+        self.path = index_path(store_directory, index_type)
+        self.index_type = index_type
+        self.stamp = BuildStamp(_stamp_path(self.path))
+        self.index = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def available(self, store):
+        """Check whether faiss is installed and this index was built from this store build.
+
+        The vectorizer rewrites the store on every refresh; an index left over
+        from an earlier build would return row ids from the old corpus.
+        """
+        if faiss is None or not self.path.exists():
+            return False
+        with self._lock:
+            return self.stamp.matches(store)
+
+    def refresh(self):
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    index = faiss.read_index(str(self.path))
+                    _configure_search(index, self.index_type)
+                    self.index = index
+                    self._signature = signature
+                    logger.info(f"Loaded {self.index_type} index with {index.ntotal} vectors")
+        return self
+
+    def search(self, query_embeddings, k):
+        """Return (scores, row_ids) arrays of shape (num_queries, k); missing hits have id -1."""
+        queries = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        return self.index.search(queries, k)
+
+
+_ann_indexes = {}
+_ann_indexes_lock = threading.Lock()
+
+
+def get_ann_index(model_name, index_type):
+    """Return the process-wide ANN index of a type for an embedding model's store."""
+    key = (model_name, index_type)
+    with _ann_indexes_lock:
+        if key not in _ann_indexes:
+            _ann_indexes[key] = AnnIndex(store_path_for_model(model_name), index_type)
+        return _ann_indexes[key]
+
+
+def _percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000) if samples else 0.0
+
+
+def _neighbors(ids, row, k):
+    """The first k found ids other than the query's own row."""
+    return set([i for i in ids.tolist() if i >= 0 and i != row][:k])
+
+
+def recall_latency_report(store, index_types=INDEX_TYPES, k=5, num_queries=200, seed=0, nlist=None, hnsw_m=32):
+    """Measure recall@k against exact search, plus per-query p50/p99 latency.
+
+    Queries are a random sample of the stored vectors, searched one at a time
+    the way the app issues them. Each query's own row is excluded from both
+    result lists; it is a trivial top-1 hit that would inflate recall.
+    Returns one dict per index type.
+    """
+    _require_faiss()
+    vectors = np.ascontiguousarray(store.vectors, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(len(vectors), size=min(num_queries, len(vectors)), replace=False)
+    queries = vectors[sample]
+
+    exact = build_ann_index(vectors, "flat")
+    _, found = exact.search(queries, k + 1)
+    truth = [_neighbors(ids, row, k) for ids, row in zip(found, sample)]
+
+    report = []
+    for index_type in index_types:
+        start = time.perf_counter()
+        index = build_ann_index(vectors, index_type, nlist=nlist, hnsw_m=hnsw_m)
+        build_seconds = time.perf_counter() - start
+        _configure_search(index, index_type)
+
+        latencies, hits = [], 0
+        for query, row, expected in zip(queries, sample, truth):
+            start = time.perf_counter()
+            _, found = index.search(query[np.newaxis, :], k + 1)
+            latencies.append(time.perf_counter() - start)
+            hits += len(_neighbors(found[0], row, k) & expected)
+
+        report.append({
+            "index_type": index_type,
+            "recall_at_k": hits / max(1, sum(len(expected) for expected in truth)),
+            "p50_ms": _percentile_ms(latencies, 50),
+            "p99_ms": _percentile_ms(latencies, 99),
+            "build_seconds": build_seconds,
+        })
+    return report
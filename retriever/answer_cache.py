@@ -0,0 +1,143 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .embedding_cache import normalize_query
+from .search_index import embed_queries
+
+__all__ = ['SemanticAnswerCache', 'context_fingerprint', 'get_answer_cache']
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = int(os.getenv("ANSWER_CACHE_SIZE", "256"))
+DEFAULT_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL", "3600"))
+DEFAULT_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+
+
+def context_fingerprint(context_text):
+    """Stable fingerprint of the exact context an answer was generated from."""
+    return hashlib.sha256(context_text.encode("utf-8")).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("embedding", "fingerprint", "answer", "created_at")
+
+    def __init__(self, embedding, fingerprint, answer, created_at):
+        self.embedding = embedding
+        self.fingerprint = fingerprint
+        self.answer = answer
+        self.created_at = created_at
+
+
+class SemanticAnswerCache:
+    """In-process LRU of generated answers, matched by query embedding similarity.
+
+    An entry is reused only for a query whose embedding is within threshold
+    cosine similarity of the cached one and whose context fingerprint is
+    identical, so paraphrases share an answer but different players or rosters
+    never do. Entries expire after ttl seconds and the whole cache is dropped
+    when the data version (the vector store build) changes.
+    """
+
+    def __init__(self, embed, capacity=DEFAULT_CAPACITY, ttl=DEFAULT_TTL_SECONDS, threshold=DEFAULT_THRESHOLD):
+        self.embed = embed
+        self.capacity = capacity
+        self.ttl = ttl
+        self.threshold = threshold
+        self.data_version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _sync_version(self, data_version):
+        if data_version != self.data_version:
+            if self._entries:
+                logger.info("Rankings data changed, dropping cached answers")
+            self._entries.clear()
+            self.data_version = data_version
+
+    def _embeddings(self, queries):
+        """Unit-length embeddings, one row per query, or None if embedding failed (the cache is then bypassed)."""
+        try:
+            embeddings = np.asarray(self.embed(queries), dtype=np.float32).reshape(len(queries), -1)
+        except Exception as e:
+            logger.warning(f"Answer cache could not embed query: {str(e)}")
+            return None
+        return embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+    def get(self, query, fingerprint, data_version):
+        """Return a cached answer for a query and context, or None."""
+        if self.capacity <= 0:
+            return None
+        key = normalize_query(query)
+        now = time.monotonic()
+        with self._lock:
+            self._sync_version(data_version)
+            for cached_key in [k for k, e in self._entries.items() if now - e.created_at > self.ttl]:
+                del self._entries[cached_key]
+
+            # Identical questions need no embedding at all
+            entry = self._entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint:
+                self._entries.move_to_end(key)
+                return entry.answer
+            candidates = [(k, e) for k, e in self._entries.items() if e.fingerprint == fingerprint]
+        if not candidates:
+            return None
+
+        # Entries are embedded lazily, together with the query, the first time they could match
+        pending = [k for k, e in candidates if e.embedding is None]
+        embeddings = self._embeddings([key] + pending)
+        if embeddings is None:
+            return None
+        embedding = embeddings[0]
+        fetched = dict(zip(pending, embeddings[1:]))
+        for cached_key, entry in candidates:
+            if entry.embedding is None:
+                entry.embedding = fetched[cached_key]
+        similarities = np.stack([e.embedding for _, e in candidates]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        best_key, entry = candidates[best]
+        with self._lock:
+            if best_key in self._entries:
+                self._entries.move_to_end(best_key)
+        logger.info(f"Answer cache hit (similarity {similarities[best]:.3f})")
+        return entry.answer
+
+    def put(self, query, fingerprint, data_version, answer):
+        """Cache an answer for a query and the context it was generated from."""
+        if self.capacity <= 0:
+            return
+        key = normalize_query(query)
+        with self._lock:
+            self._sync_version(data_version)
+            # No embedding yet: questions answered without one (named players)
+            # should not pay for it here. get() embeds on demand
+            self._entries[key] = _Entry(None, fingerprint, answer, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached answer."""
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache():
+    """Return the process-wide answer cache, shared by every session."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticAnswerCache(embed_queries)
+        return _cache
@@ -1,7 +1,15 @@
 import os
+import logging
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from .answer_cache import get_answer_cache, context_fingerprint
+from .context_packer import pack_context
+from .query_router import route_query, system_prompt
+from .search_index import data_version
+
+logger = logging.getLogger(__name__)
+
 load_dotenv()
 
 print("🔑 Using Key:", os.getenv("OPENAI_API_KEY")[:10])
@@ -12,60 +20,92 @@ if api_key:
     os.environ["OPENAI_API_KEY"] = api_key
 client = OpenAI()
 
-def format_chunk(chunk):
-    """Convert context chunk (dict or str) into a readable string."""
-    if isinstance(chunk, dict):
-        return "\n".join(f"{k}: {v}" for k, v in chunk.items())
-    return str(chunk)
-
-def ask_rag(query, context_chunks):
-    # Convert each chunk to string
-    context_text = "\n\n".join([format_chunk(chunk) for chunk in context_chunks])
-
-    # Determine query type
-    is_rookie_query = any(word in query.lower() for word in ['rookie', 'rookies', '2025 draft', 'first year'])
-    is_matchup_question = any(keyword in query.lower() for keyword in [
-        "matchup", "schedule", "season", "outlook", "ros", "rest of season",
-        "upcoming", "future", "games", "weeks", "look", "looking"
-    ])
-    is_lineup_question = any(keyword in query.lower() for keyword in [
-        "lineup", "draft", "pick", "roster", "team", "start", "bench", "flex"
-    ])
-
-    system_message = """You are an expert fantasy football analyst providing advice. 
-When analyzing players:
-1. Consider their current performance metrics and rankings
-2. Evaluate their upcoming matchups and strength of schedule
-3. Account for team situation, injuries, and offensive scheme
-4. Look at historical performance and trends
-5. Consider matchup-specific factors (e.g., home/away, defense vs. position)
-
-For rookie analysis specifically:
-1. Consider their draft position and college performance
-2. Evaluate their team's offensive scheme and opportunity
-3. Look at the depth chart and competition for targets/touches
-4. Consider the team's investment in the player
-5. Factor in their learning curve and NFL readiness
-
-Provide clear, actionable advice with specific insights about:
-- Player's situation and outlook
-- Draft position and value
-- Opportunity and role
-- Relevant comparisons to established players
-
-Be direct and specific in your recommendations. If discussing rookies, acknowledge their rookie status and the uncertainty that comes with first-year players."""
-
+def build_messages(query, context_text, route=None):
+    """Chat messages for a question answered from the given context text."""
+    route = route or route_query(query)
     messages = [
-        {"role": "system", "content": system_message},
+        {"role": "system", "content": system_prompt(route.template)},
         {"role": "user", "content": f"Using this context about fantasy football players:\n\n{context_text}\n\nAnswer this question: {query}"}
     ]
 
+    return messages
+
+def _prepare(query, context_chunks, route):
+    """Build the messages and look up the answer cache for a question.
+
+    Returns (messages, cached_answer, remember) where remember(answer) stores
+    a freshly generated answer under the same cache key.
+    """
+    # Deduplicated, noise-free context within the route's prompt token budget
+    context_text = pack_context(context_chunks, budget=route.context_tokens)
+
+    # Paraphrases of an already answered question over the same context reuse its answer;
+    # the route is part of the key so a cheap-tier answer never stands in for a strong one
+    cache = get_answer_cache()
+    fingerprint = context_fingerprint(f"{route.model}\n{route.template}\n{context_text}")
+    try:
+        version = data_version()
+    except Exception as e:
+        # A store caught mid-rewrite only costs the cache; the answer is still generated
+        logger.warning(f"Skipping the answer cache, data version unavailable: {str(e)}")
+        return build_messages(query, context_text, route), None, lambda answer: None
+    cached = cache.get(query, fingerprint, version)
+
+    def remember(answer):
+        cache.put(query, fingerprint, version, answer)
+
+    return build_messages(query, context_text, route), cached, remember
+
+def ask_rag(query, context_chunks, route=None):
+    """Answer a question from context with the model, prompt and length its route picks."""
+    route = route or route_query(query)
+    messages, cached, remember = _prepare(query, context_chunks, route)
+    if cached is not None:
+        return cached
+
     response = client.chat.completions.create(
-        model="gpt-4",
+        model=route.model,
+        messages=messages,
+        temperature=0.7,
+        max_tokens=route.max_tokens
+    )
+
+    answer = response.choices[0].message.content.strip()
+    remember(answer)
+    return answer
+
+def ask_rag_stream(query, context_chunks, route=None):
+    """Like ask_rag, but yields the answer text piece by piece as it is generated.
+
+    Cached answers are yielded whole. An answer is only cached once the stream
+    has finished, so an abandoned stream never leaves a truncated answer behind.
+    """
+    route = route or route_query(query)
+    messages, cached, remember = _prepare(query, context_chunks, route)
+    if cached is not None:
+        yield cached
+        return
+
+    stream = client.chat.completions.create(
+        model=route.model,
         messages=messages,
         temperature=0.7,
-        max_tokens=1000
+        max_tokens=route.max_tokens,
+        stream=True
     )
 
-    return response.choices[0].message.content.strip()
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            # Hold back leading whitespace so the rendered answer matches ask_rag's stripped one
+            if not parts:
+                delta = delta.lstrip()
+                if not delta:
+                    continue
+            parts.append(delta)
+            yield delta
 
+    remember("".join(parts).strip())
@@ -0,0 +1,30 @@
+__all__ = ['EXAMPLE_QUESTIONS', 'QUICK_QUESTIONS', 'SUGGESTIONS', 'CANNED_QUESTIONS']
+
+# Example buttons on the app.py general tab
+EXAMPLE_QUESTIONS = [
+    "Who are the top 5 running backs for PPR leagues?",
+    "Which rookie wide receivers should I target in the draft?",
+    "Who are the best sleeper picks this season?",
+    "Compare Justin Jefferson vs Ja'Marr Chase for this season",
+    "What's the best draft strategy for the 1st round?",
+]
+
+# Quick question buttons in streamlit_app.py
+QUICK_QUESTIONS = {
+    "Top Players": "Who are the top 5 QBs this week?",
+    "Start/Sit": "Should I start Josh Allen or Patrick Mahomes?",
+    "Rookies": "What rookie WRs should I target in the draft?",
+    "Waiver Wire": "Who are the best waiver wire pickups this week?"
+}
+
+# Suggestion buttons above the app.py query box (answered with roster context once a league is selected)
+SUGGESTIONS = {
+    "Analyze Keepers": "Who are my best keeper options based on draft position and current rankings?",
+    "Compare Players": "Compare my current roster players for keeper value",
+    "Draft Strategy": "What should my draft strategy be based on my keepers?",
+}
+
+# Every fixed question the UI offers; these get precomputed answers after each data rebuild
+CANNED_QUESTIONS = list(dict.fromkeys(
+    EXAMPLE_QUESTIONS + list(QUICK_QUESTIONS.values()) + list(SUGGESTIONS.values())
+))
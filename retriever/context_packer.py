@@ -0,0 +1,89 @@
+import os
+import logging
+
+from .tokens import count_tokens
+
+__all__ = ['pack_context', 'format_fields']
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+# Fields that cost prompt tokens without telling the model anything
+NOISE_FIELDS = {"score", "player_id", "player_short_name", "text_hash"}
+SEPARATOR = "\n\n"
+
+
+def format_fields(chunk):
+    """Render a record or dict as "key: value" lines, skipping noise and empty fields."""
+    if hasattr(chunk, "_asdict"):
+        chunk = chunk._asdict()
+    return "\n".join(
+        f"{key}: {value}" for key, value in chunk.items()
+        if key not in NOISE_FIELDS and value is not None and value != ""
+    )
+
+
+def _record_key(record):
+    player_id = record.get("player_id")
+    return ("id", player_id) if player_id is not None else ("name", record.get("player_name"))
+
+
+def _truncate_lines(text, budget, model):
+    """Longest prefix of whole lines that fits in budget tokens."""
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = count_tokens(line + "\n", model)
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def pack_context(chunks, budget=CONTEXT_TOKEN_BUDGET, model="gpt-4"):
+    """Assemble context text from search records and free-text chunks within a token budget.
+
+    Records are deduplicated by player, stripped of noise and null fields and
+    packed highest score first. Free-text chunks (such as the roster summary)
+    get first claim on the budget but are trimmed at line boundaries to half
+    of it each, so they can never crowd out retrieval results entirely.
+    """
+    records, texts, seen = [], [], set()
+    for position, chunk in enumerate(chunks):
+        if hasattr(chunk, "_asdict") or isinstance(chunk, dict):
+            record = chunk._asdict() if hasattr(chunk, "_asdict") else dict(chunk)
+            key = _record_key(record)
+            if key in seen:
+                continue
+            seen.add(key)
+            records.append((record.get("score"), position, record))
+        else:
+            text = str(chunk).strip()
+            if text and text not in seen:
+                seen.add(text)
+                texts.append(text)
+
+    separator_cost = count_tokens(SEPARATOR, model)
+    remaining = budget
+    packed_texts = []
+    for text in texts:
+        text = _truncate_lines(text, min(remaining, budget // 2) - separator_cost, model)
+        if text:
+            packed_texts.append(text)
+            remaining -= count_tokens(text, model) + separator_cost
+
+    # Highest score first; unscored records keep their retrieval order after scored ones
+    records.sort(key=lambda item: (item[0] is None, -(item[0] or 0.0), item[1]))
+    packed_records, dropped = [], 0
+    for _, _, record in records:
+        text = format_fields(record)
+        cost = count_tokens(text, model) + separator_cost
+        if cost > remaining:
+            dropped += 1
+            continue
+        packed_records.append(text)
+        remaining -= cost
+
+    if dropped:
+        logger.info(f"Context budget of {budget} tokens reached; dropped {dropped} records")
+    return SEPARATOR.join(packed_records + packed_texts)
@@ -0,0 +1,123 @@
+import os
+import re
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+__all__ = ['QueryEmbeddingCache', 'get_embedding_cache', 'normalize_query']
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CACHE_DB_PATH = DATA_DIR / "embedding_cache.sqlite"
+DEFAULT_CAPACITY = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+
+
+def normalize_query(query):
+    """Normalize a query so trivially different spellings share a cache entry."""
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+
+class QueryEmbeddingCache:
+    """Two-tier cache of query embeddings for a single embedding model.
+
+    Lookups hit a bounded in-memory LRU first and fall back to a SQLite file
+    that is shared across processes and survives restarts. Entries are keyed by
+    model name and normalized query text.
+    """
+
+    def __init__(self, model, capacity=DEFAULT_CAPACITY, db_path=CACHE_DB_PATH):
+        self.model = model
+        self.capacity = capacity
+        self.db_path = Path(db_path) if db_path else None
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None and self.db_path is not None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                "model TEXT NOT NULL, query TEXT NOT NULL, embedding BLOB NOT NULL, "
+                "PRIMARY KEY (model, query))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key, embedding):
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def get(self, query):
+        """Return the cached embedding for a query, or None."""
+        key = normalize_query(query)
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                return embedding
+
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT embedding FROM query_embeddings WHERE model = ? AND query = ?",
+                    (self.model, key)
+                ).fetchone() if conn else None
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache read failed: {str(e)}")
+                return None
+
+            if row is None:
+                return None
+            embedding = np.frombuffer(row[0], dtype=np.float32)
+            self._remember(key, embedding)
+            return embedding
+
+    def put(self, query, embedding):
+        """Store a query embedding in memory and on disk."""
+        key = normalize_query(query)
+        embedding = np.asarray(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        with self._lock:
+            self._remember(key, embedding)
+            try:
+                conn = self._connection()
+                if conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO query_embeddings (model, query, embedding) VALUES (?, ?, ?)",
+                        (self.model, key, embedding.tobytes())
+                    )
+                    conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache write failed: {str(e)}")
+
+    def clear(self):
+        """Drop every cached embedding for this model."""
+        with self._lock:
+            self._memory.clear()
+            conn = self._connection()
+            if conn:
+                conn.execute("DELETE FROM query_embeddings WHERE model = ?", (self.model,))
+                conn.commit()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model):
+    """Return the process-wide embedding cache for a model."""
+    with _caches_lock:
+        if model not in _caches:
+            _caches[model] = QueryEmbeddingCache(model)
+        return _caches[model]
@@ -0,0 +1,128 @@
+import os
+import logging
+import threading
+from abc import ABC, abstractmethod
+
+import numpy as np
+import openai
+
+__all__ = [
+    'EmbeddingProvider',
+    'OpenAIEmbeddingProvider',
+    'LocalEmbeddingProvider',
+    'get_embedding_provider',
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
+
+
+class EmbeddingProvider(ABC):
+    """Turns a list of texts into a (len(texts), dim) float32 matrix."""
+
+    model_name = None
+
+    @abstractmethod
+    def embed(self, texts):
+        """Embed texts, one float32 row per text in input order."""
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """Embeddings from the OpenAI API. Uses the key set by get_openai_client."""
+
+    def __init__(self, model_name="text-embedding-ada-002"):
+        self.model_name = model_name
+
+    def embed(self, texts):
+        texts = list(texts)
+        response = openai.embeddings.create(
+            input=texts,
+            model=self.model_name
+        )
+        # The API does not guarantee response order, so place rows by their index
+        embeddings = np.empty((len(texts), len(response.data[0].embedding)), dtype=np.float32)
+        for item in response.data:
+            embeddings[item.index] = item.embedding
+        return embeddings
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """In-process CPU embeddings from the same MiniLM model build_embeddings.py uses.
+
+    torch and transformers are imported on first use, so they are only needed
+    when this provider is selected.
+    """
+
+    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2"):
+        self.model_name = model_name
+        self._tokenizer = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from transformers import AutoTokenizer, AutoModel
+
+                    logger.info(f"Loading local embedding model {self.model_name}")
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                    model = AutoModel.from_pretrained(self.model_name)
+                    model.eval()
+                    self._model = model
+        return self._tokenizer, self._model
+
+    def embed(self, texts, batch_size=64, show_progress=False):
+        """Embed texts in length-sorted batches; rows come back in input order."""
+        texts = list(texts)
+        tokenizer, model = self._load()
+        embeddings = np.empty((len(texts), model.config.hidden_size), dtype=np.float32)
+
+        # Sorting by length keeps similar-length texts together so per-batch padding is small
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batches = [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+        if show_progress:
+            from tqdm import tqdm
+            batches = tqdm(batches, desc="Creating embeddings")
+
+        for batch in batches:
+            embeddings[batch] = self._encode([texts[i] for i in batch])
+        return embeddings
+
+    def _encode(self, texts):
+        import torch
+
+        tokenizer, model = self._load()
+        inputs = tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+        with torch.no_grad():
+            outputs = model(**inputs)
+        # Mean-pool over real tokens only so padding does not dilute short texts
+        mask = inputs["attention_mask"].unsqueeze(-1).to(outputs.last_hidden_state.dtype)
+        summed = (outputs.last_hidden_state * mask).sum(dim=1)
+        counts = mask.sum(dim=1).clamp(min=1e-9)
+        return (summed / counts).numpy().astype(np.float32)
+
+
+PROVIDERS = {
+    "openai": OpenAIEmbeddingProvider,
+    "local": LocalEmbeddingProvider,
+}
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def get_embedding_provider(name=None):
+    """Return the process-wide embedding provider.
+
+    The provider is chosen by name, falling back to the EMBEDDING_PROVIDER
+    environment variable ("openai" or "local").
+    """
+    name = (name or DEFAULT_PROVIDER).lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown embedding provider '{name}'. Choose one of: {', '.join(PROVIDERS)}")
+    with _providers_lock:
+        if name not in _providers:
+            _providers[name] = PROVIDERS[name]()
+        return _providers[name]
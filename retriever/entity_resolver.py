@@ -0,0 +1,210 @@
+import re
+import difflib
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+__all__ = ['EntityResolver', 'PlayerMatch', 'normalize_name']
+
+NAME_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Generational suffixes are dropped so "Patrick Mahomes" matches "Patrick Mahomes II"
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+SLEEPER_POSITIONS = {"QB", "RB", "WR", "TE", "K", "DEF"}
+FUZZY_THRESHOLD = 0.85
+FUZZY_WINDOW = (2, 3)
+_END = "\0"
+
+
+def _tokens(text):
+    # "Ja'Marr" -> "jamarr", "A.J." -> "aj", "Amon-Ra St. Brown" -> "amon ra st brown"
+    text = re.sub(r"['’.]", "", text.lower())
+    return NAME_TOKEN_RE.findall(text)
+
+
+def normalize_name(name):
+    """Lowercase name tokens without punctuation or a trailing generational suffix."""
+    tokens = _tokens(name)
+    while len(tokens) > 2 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def _trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerMatch(NamedTuple):
+    """A player named in a question."""
+    name: str
+    player_ids: Tuple[int, ...]
+    sleeper_ids: Tuple[str, ...]
+    score: float
+
+
+class _Entity:
+    __slots__ = ("name", "player_ids", "sleeper_ids")
+
+    def __init__(self, name):
+        self.name = name
+        self.player_ids = []
+        self.sleeper_ids = []
+
+
+class EntityResolver:
+    """Spots player names in free text and maps them to store rows and Sleeper ids.
+
+    Exact names are found with a token trie in one left-to-right pass (longest
+    match wins). Spans not covered by an exact name are tried against a
+    character-trigram index and confirmed with difflib, which catches
+    misspellings like "Jamar Chase".
+
+    A resolver is never modified after construction, so readers need no lock;
+    adding Sleeper names means building a new resolver and swapping it in.
+    """
+
+    def __init__(self, store, sleeper_players=None):
+        ids = np.asarray(store.columns["player_id"]).tolist()
+        self.rows_by_id = {}
+        for row, player_id in enumerate(ids):
+            if player_id >= 0:
+                self.rows_by_id.setdefault(player_id, []).append(row)
+
+        self._entities = {}
+        self._trie = {}
+        self._by_trigram = {}
+        names = np.asarray(store.columns["player_name"]).tolist()
+        short_names = (
+            np.asarray(store.columns["player_short_name"]).tolist()
+            if "player_short_name" in store.columns else [""] * len(names)
+        )
+        for player_id, name, short_name in zip(ids, names, short_names):
+            if player_id < 0:
+                continue
+            for alias in (name, short_name):
+                entity = self._entity(alias, name)
+                if entity is not None and player_id not in entity.player_ids:
+                    entity.player_ids.append(player_id)
+        if sleeper_players:
+            self._add_sleeper_players(sleeper_players)
+
+    def _entity(self, alias, display_name):
+        """Return the entity for an alias, indexing the alias on first sight."""
+        key = normalize_name(alias)
+        # Single-token aliases ("Chase", "LAC") are too ambiguous to spot reliably
+        if len(key.split()) < 2:
+            return None
+        if key not in self._entities:
+            self._entities[key] = _Entity(display_name)
+            node = self._trie
+            for token in key.split():
+                node = node.setdefault(token, {})
+            node[_END] = key
+            for trigram in _trigrams(key):
+                self._by_trigram.setdefault(trigram, set()).add(key)
+        return self._entities[key]
+
+    def _add_sleeper_players(self, players):
+        """Index Sleeper full names so matches also carry Sleeper player ids.
+
+        players is the Sleeper /players/nfl mapping of player id to player dict.
+        """
+        for sleeper_id, player in players.items():
+            full_name = player.get("full_name")
+            if not full_name or player.get("position") not in SLEEPER_POSITIONS:
+                continue
+            # Only players marked inactive are skipped; an unknown (None) flag still counts
+            if player.get("active") is False:
+                continue
+            entity = self._entity(full_name, full_name)
+            if entity is not None and sleeper_id not in entity.sleeper_ids:
+                entity.sleeper_ids.append(sleeper_id)
+
+    def _exact_spans(self, tokens):
+        spans = []
+        start = 0
+        while start < len(tokens):
+            node, end, key = self._trie, start, None
+            while end < len(tokens) and tokens[end] in node:
+                node = node[tokens[end]]
+                end += 1
+                if _END in node:
+                    key, match_end = node[_END], end
+            if key is None:
+                start += 1
+            else:
+                spans.append((start, match_end, key, 1.0))
+                start = match_end
+        return spans
+
+    def _fuzzy_spans(self, tokens, covered):
+        candidates = []
+        for size in FUZZY_WINDOW:
+            for start in range(len(tokens) - size + 1):
+                if any(i in covered for i in range(start, start + size)):
+                    continue
+                window = " ".join(tokens[start:start + size])
+                trigrams = _trigrams(window)
+                counts = {}
+                for trigram in trigrams:
+                    for key in self._by_trigram.get(trigram, ()):
+                        counts[key] = counts.get(key, 0) + 1
+                for key, shared in counts.items():
+                    if shared < 0.5 * len(trigrams):
+                        continue
+                    score = difflib.SequenceMatcher(None, window, key).ratio()
+                    if score >= FUZZY_THRESHOLD:
+                        candidates.append((score, start, start + size, key))
+
+        # Best-scoring spans first; a span never overlaps one already taken
+        spans = []
+        for score, start, end, key in sorted(candidates, reverse=True):
+            if any(i in covered for i in range(start, end)):
+                continue
+            covered.update(range(start, end))
+            spans.append((start, end, key, score))
+        return spans
+
+    def resolve(self, text):
+        """Return the players named in text, in the order they appear."""
+        tokens = _tokens(text)
+        spans = self._exact_spans(tokens)
+        covered = {i for start, end, _, _ in spans for i in range(start, end)}
+        spans += self._fuzzy_spans(tokens, covered)
+
+        matches, seen = [], set()
+        for _, _, key, score in sorted(spans):
+            if key in seen:
+                continue
+            seen.add(key)
+            entity = self._entities[key]
+            matches.append(PlayerMatch(
+                name=entity.name,
+                player_ids=tuple(entity.player_ids),
+                sleeper_ids=tuple(entity.sleeper_ids),
+                score=score,
+            ))
+        return matches
+
+    def named_rows(self, text, rows=None):
+        """Return (row_ids, scores) for the ranked players named in text, or None.
+
+        Rows come from a direct player id lookup in mention order, optionally
+        restricted to the given sorted row ids. Returns None when no named
+        player has a row.
+        """
+        found, scores = [], []
+        for match in self.resolve(text):
+            for player_id in match.player_ids:
+                for row in self.rows_by_id.get(player_id, ()):
+                    if row not in found:
+                        found.append(row)
+                        scores.append(match.score)
+        found = np.array(found, dtype=np.intp)
+        scores = np.array(scores, dtype=np.float32)
+        if rows is not None:
+            keep = np.isin(found, rows)
+            found, scores = found[keep], scores[keep]
+        if len(found) == 0:
+            return None
+        return found, scores
@@ -0,0 +1,106 @@
+import re
+
+import numpy as np
+
+__all__ = ['AttributeIndex', 'infer_filters']
+
+# Phrases that scope a question to a position, matched on word boundaries
+POSITION_PATTERNS = {
+    "QB": r"qbs?|quarterbacks?",
+    "RB": r"rbs?|running ?backs?",
+    "WR": r"wrs?|wide ?receivers?|receivers?",
+    "TE": r"tes?|tight ?ends?",
+    "K": r"kickers?",
+    "DST": r"dsts?|d/st|team defenses?",
+}
+ROOKIE_PATTERN = r"rookies?|first[- ]year"
+
+
+def _as_list(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+class AttributeIndex:
+    """Precomputed row-id indexes over a vector store's metadata columns.
+
+    Built once per store load. Each lookup returns sorted row ids, so filters
+    combine with cheap sorted intersections before any vector is scored.
+    """
+
+    def __init__(self, store):
+        self.size = len(store)
+        self.by_position = self._group(store.columns["position"], split=True)
+        self.by_team = self._group(store.columns["team"])
+        rookie = store.columns["rookie"] if "rookie" in store.columns else np.full(self.size, -1, dtype=np.int8)
+        self.rookie_rows = np.flatnonzero(np.asarray(rookie) == 1)
+        self.veteran_rows = np.flatnonzero(np.asarray(rookie) == 0)
+
+        # Rows ordered by ECR so a rank range is two binary searches
+        ecr = np.asarray(store.columns["ecr_rank"])
+        ranked = np.flatnonzero(ecr >= 0)
+        order = np.argsort(ecr[ranked], kind="stable")
+        self.ecr_rows = ranked[order]
+        self.ecr_values = ecr[ranked][order]
+
+    @staticmethod
+    def _group(values, split=False):
+        groups = {}
+        for row, value in enumerate(np.asarray(values).tolist()):
+            # Multi-position players (e.g. "WR,RB") are listed under each position
+            keys = value.split(",") if split else [value]
+            for key in keys:
+                key = key.strip().upper()
+                if key:
+                    groups.setdefault(key, []).append(row)
+        return {key: np.array(rows, dtype=np.intp) for key, rows in groups.items()}
+
+    def _union(self, groups, keys):
+        rows = [groups.get(key.upper(), np.empty(0, dtype=np.intp)) for key in keys]
+        return np.unique(np.concatenate(rows)) if rows else np.empty(0, dtype=np.intp)
+
+    def rows(self, position=None, team=None, rookie=None, ecr_range=None):
+        """Return sorted row ids matching every given filter, or None when no filter is set.
+
+        position and team accept a single value or a list; ecr_range is an
+        inclusive (low, high) pair where either bound may be None.
+        """
+        selections = []
+        positions = _as_list(position)
+        if positions:
+            selections.append(self._union(self.by_position, positions))
+        teams = _as_list(team)
+        if teams:
+            selections.append(self._union(self.by_team, teams))
+        if rookie is not None:
+            selections.append(self.rookie_rows if rookie else self.veteran_rows)
+        if ecr_range is not None:
+            low, high = ecr_range
+            start = 0 if low is None else np.searchsorted(self.ecr_values, low, side="left")
+            end = len(self.ecr_values) if high is None else np.searchsorted(self.ecr_values, high, side="right")
+            selections.append(np.sort(self.ecr_rows[start:end]))
+
+        if not selections:
+            return None
+        rows = selections[0]
+        for other in selections[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+
+def infer_filters(query):
+    """Derive search filters from positions and rookie mentions in a question."""
+    text = query.lower()
+    filters = {}
+    positions = [
+        position for position, pattern in POSITION_PATTERNS.items()
+        if re.search(rf"\b(?:{pattern})\b", text)
+    ]
+    if positions:
+        filters["position"] = positions
+    if re.search(rf"\b(?:{ROOKIE_PATTERN})\b", text):
+        filters["rookie"] = True
+    return filters
@@ -0,0 +1,70 @@
+import re
+
+import numpy as np
+
+from .ranking import top_k_indices
+
+__all__ = ['BM25Index', 'tokenize']
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercase word tokens; apostrophes are dropped so "Ja'Marr" and "Jamarr" match.
+
+    Bare numbers are skipped: in ranking texts they are ranks and ownership
+    percentages, which would make "top 5" match whoever is ranked #5.
+    """
+    tokens = TOKEN_RE.findall(text.lower().replace("'", "").replace("’", ""))
+    return [token for token in tokens if not token.isdigit()]
+
+
+class BM25Index:
+    """In-memory inverted index with Okapi BM25 scoring.
+
+    Per-posting weights are precomputed at build time, so a query is one
+    vector add per query term. Terms found in more than max_df of the
+    documents (the boilerplate of the ranking texts) are not indexed.
+    """
+
+    def __init__(self, texts, k1=1.5, b=0.75, max_df=0.5):
+        texts = list(texts)
+        self.size = len(texts)
+        doc_tokens = [tokenize(text) for text in texts]
+        doc_lengths = np.array([len(tokens) for tokens in doc_tokens], dtype=np.float32)
+        avg_length = float(doc_lengths.mean()) if self.size else 0.0
+
+        term_frequencies = {}
+        for doc_id, tokens in enumerate(doc_tokens):
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                term_frequencies.setdefault(token, []).append((doc_id, count))
+
+        self.postings = {}
+        for term, entries in term_frequencies.items():
+            if len(entries) > max_df * self.size:
+                continue
+            doc_ids = np.array([doc_id for doc_id, _ in entries], dtype=np.intp)
+            tf = np.array([count for _, count in entries], dtype=np.float32)
+            idf = np.log(1 + (self.size - len(entries) + 0.5) / (len(entries) + 0.5))
+            norm = k1 * (1 - b + b * doc_lengths[doc_ids] / max(avg_length, 1e-9))
+            self.postings[term] = (doc_ids, (idf * tf * (k1 + 1) / (tf + norm)).astype(np.float32))
+
+    def scores(self, query):
+        """BM25 score of every document for a query."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                doc_ids, weights = posting
+                scores[doc_ids] += weights
+        return scores
+
+    def search(self, query, top_k, rows=None):
+        """Return (row_ids, scores) of the best matching rows, best first, zero scores excluded."""
+        scores = self.scores(query)
+        candidates = np.flatnonzero(scores) if rows is None else rows[scores[rows] > 0]
+        best = top_k_indices(scores[candidates], top_k)
+        return candidates[best], scores[candidates[best]]
@@ -0,0 +1,119 @@
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+
+from .ask_rag import ask_rag
+from .canned_questions import CANNED_QUESTIONS
+from .embedding_cache import normalize_query
+from .query_router import route_query
+from .search_index import search_with_filters, data_version
+
+__all__ = ['precompute_answers', 'get_precomputed_answer']
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+PRECOMPUTED_PATH = DATA_DIR / "precomputed_answers.json"
+
+
+def _read(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def precompute_answers(questions=CANNED_QUESTIONS, path=PRECOMPUTED_PATH, force=False):
+    """Answer every canned question against the current rankings data and save the results.
+
+    Does nothing when the saved answers already cover these questions for the
+    current data version, so it is cheap to run after every rebuild.
+    Returns the number of questions answered.
+    """
+    path = Path(path)
+    version = data_version()
+    if version is None:
+        logger.error("Rankings data has not been indexed; nothing to precompute")
+        return 0
+
+    existing = _read(path)
+    if (
+        not force and existing and existing.get("data_version") == version
+        and all(normalize_query(q) in existing.get("answers", {}) for q in questions)
+    ):
+        logger.info("Precomputed answers are up to date")
+        return 0
+
+    answers = {}
+    for question in questions:
+        route = route_query(question)
+        # Same retrieval as the app: filters inferred from the question, relaxed until something matches
+        sources = search_with_filters(question, top_k=route.top_k)
+        if not sources:
+            logger.warning(f"No context found for canned question: {question}")
+            continue
+        answers[normalize_query(question)] = {
+            "question": question,
+            "answer": ask_rag(question, sources, route),
+            "sources": [source._asdict() for source in sources],
+        }
+        logger.info(f"Precomputed answer for: {question}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"data_version": version, "answers": answers}, f, indent=2)
+    os.replace(tmp_path, path)
+    return len(answers)
+
+
+class _PrecomputedStore:
+    """Saved answers, reloaded when the file changes and ignored once the data moves on."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.data = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def get(self, question):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if signature != self._signature:
+                self.data = _read(self.path) or {}
+                self._signature = signature
+            data = self.data
+        if data.get("data_version") != data_version():
+            return None
+        return data.get("answers", {}).get(normalize_query(question))
+
+
+_store = _PrecomputedStore(PRECOMPUTED_PATH)
+
+
+def get_precomputed_answer(question):
+    """Return {"question", "answer", "sources"} saved for a canned question, or None."""
+    try:
+        return _store.get(question)
+    except Exception as e:
+        logger.error(f"Precomputed answer lookup failed: {str(e)}")
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Precompute answers for the app's canned questions.")
+    parser.add_argument("--force", action="store_true", help="Recompute even if the data has not changed")
+    args = parser.parse_args()
+
+    count = precompute_answers(force=args.force)
+    print(f"✅ Precomputed {count} answers to {PRECOMPUTED_PATH}")
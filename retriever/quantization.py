@@ -0,0 +1,231 @@
+import os
+import logging
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .ranking import top_k_indices
+from .vector_store import BuildStamp, store_path_for_model, write_build_stamp
+
+__all__ = [
+    'QUANTIZATION_MODES',
+    'ScalarQuantizer',
+    'ProductQuantizer',
+    'QuantizedIndex',
+    'build_quantized_codes',
+    'get_quantized_index',
+]
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_MODES = ("int8", "pq")
+# Rows scored per chunk, so dequantization never allocates a full float32 copy of the corpus
+SCORE_CHUNK_ROWS = 8192
+
+
+class ScalarQuantizer:
+    """Symmetric per-dimension int8 quantization (4x smaller than float32)."""
+
+    def __init__(self, scale):
+        self.scale = np.asarray(scale, dtype=np.float32)
+
+    @classmethod
+    def train(cls, vectors):
+        max_abs = np.abs(np.asarray(vectors, dtype=np.float32)).max(axis=0)
+        return cls(np.maximum(max_abs, 1e-12) / 127.0)
+
+    def encode(self, vectors):
+        codes = np.rint(np.asarray(vectors, dtype=np.float32) / self.scale)
+        return np.clip(codes, -127, 127).astype(np.int8)
+
+    def scores(self, codes, queries):
+        """Approximate inner products between (nq, dim) queries and every coded row."""
+        # Fold the scale into the queries: (codes * scale) @ q == codes @ (q * scale)
+        scaled = (queries * self.scale).T
+        out = np.empty((queries.shape[0], codes.shape[0]), dtype=np.float32)
+        for start in range(0, codes.shape[0], SCORE_CHUNK_ROWS):
+            chunk = np.asarray(codes[start:start + SCORE_CHUNK_ROWS], dtype=np.float32)
+            out[:, start:start + len(chunk)] = (chunk @ scaled).T
+        return out
+
+
+def _default_subspaces(dim, sub_dim=8):
+    """Largest subspace count with at most sub_dim dims per subspace that divides dim."""
+    for m in range(max(1, dim // sub_dim), dim + 1):
+        if dim % m == 0:
+            return m
+    return dim
+
+
+def _kmeans(points, k, iterations, rng):
+    centroids = points[rng.choice(len(points), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        distances = (
+            (points ** 2).sum(axis=1, keepdims=True)
+            - 2 * points @ centroids.T
+            + (centroids ** 2).sum(axis=1)
+        )
+        assignment = distances.argmin(axis=1)
+        for c in range(k):
+            members = points[assignment == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+    return centroids
+
+
+class ProductQuantizer:
+    """Product quantization: each vector becomes one uint8 centroid id per subspace."""
+
+    def __init__(self, centroids):
+        # (num_subspaces, num_centroids, sub_dim)
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+
+    @property
+    def num_subspaces(self):
+        return self.centroids.shape[0]
+
+    @classmethod
+    def train(cls, vectors, num_subspaces=None, num_centroids=256, iterations=20, sample_size=20000, seed=0):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        n, dim = vectors.shape
+        m = num_subspaces or _default_subspaces(dim)
+        if dim % m:
+            raise ValueError(f"Vector dim {dim} is not divisible into {m} subspaces")
+        k = min(num_centroids, 256, n)
+
+        rng = np.random.default_rng(seed)
+        if n > sample_size:
+            vectors = vectors[rng.choice(n, size=sample_size, replace=False)]
+        subspaces = vectors.reshape(len(vectors), m, dim // m)
+        centroids = np.stack([_kmeans(subspaces[:, j, :], k, iterations, rng) for j in range(m)])
+        return cls(centroids)
+
+    def encode(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        m, _, sub_dim = self.centroids.shape
+        subspaces = vectors.reshape(len(vectors), m, sub_dim)
+        codes = np.empty((len(vectors), m), dtype=np.uint8)
+        for j in range(m):
+            distances = (
+                -2 * subspaces[:, j, :] @ self.centroids[j].T
+                + (self.centroids[j] ** 2).sum(axis=1)
+            )
+            codes[:, j] = distances.argmin(axis=1)
+        return codes
+
+    def scores(self, codes, queries):
+        """Approximate inner products via per-query lookup tables (asymmetric distance)."""
+        m, _, sub_dim = self.centroids.shape
+        out = np.empty((queries.shape[0], codes.shape[0]), dtype=np.float32)
+        subspace_ids = np.arange(m)
+        for q, query in enumerate(queries):
+            # table[j, c] = <query subvector j, centroid c of subspace j>
+            table = np.einsum("jkd,jd->jk", self.centroids, query.reshape(m, sub_dim))
+            for start in range(0, codes.shape[0], SCORE_CHUNK_ROWS):
+                chunk = np.asarray(codes[start:start + SCORE_CHUNK_ROWS])
+                out[q, start:start + len(chunk)] = table[subspace_ids, chunk].sum(axis=1)
+        return out
+
+
+def _code_paths(store_directory, mode):
+    directory = Path(store_directory)
+    return directory / f"{mode}_codes.npy", directory / f"{mode}_params.npy"
+
+
+def _stamp_path(store_directory, mode):
+    return Path(store_directory) / f"{mode}_codes.json"
+
+
+def _save_atomic(path, array):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def build_quantized_codes(store, mode):
+    """Train a quantizer on a store's vectors and save its codes next to them."""
+    vectors = np.asarray(store.vectors, dtype=np.float32)
+    if mode == "int8":
+        quantizer = ScalarQuantizer.train(vectors)
+        params = quantizer.scale
+    elif mode == "pq":
+        quantizer = ProductQuantizer.train(vectors)
+        params = quantizer.centroids
+    else:
+        raise ValueError(f"Unknown quantization mode '{mode}'. Choose one of: {', '.join(QUANTIZATION_MODES)}")
+
+    codes_path, params_path = _code_paths(store.directory, mode)
+    # Parameters first; the loader keys reloads off the codes file
+    _save_atomic(params_path, params)
+    _save_atomic(codes_path, quantizer.encode(vectors))
+    # Stamp last: until it matches the store, readers keep using exact search
+    write_build_stamp(_stamp_path(store.directory, mode), store)
+    return codes_path
+
+
+class QuantizedIndex:
+    """Approximate scoring over quantized codes with an exact float re-score.
+
+    Only the codes are scanned for every query; the float32 matrix is touched
+    just for the candidate rows, so a worker's resident set is mostly the codes.
+    """
+
+    def __init__(self, store_directory, mode):
+        self.mode = mode
+        self.codes_path, self.params_path = _code_paths(store_directory, mode)
+        self.stamp = BuildStamp(_stamp_path(store_directory, mode))
+        self.codes = None
+        self.quantizer = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def available(self, store):
+        """Check whether codes exist and were built from this store build."""
+        if not (self.codes_path.exists() and self.params_path.exists()):
+            return False
+        with self._lock:
+            return self.stamp.matches(store)
+
+    def refresh(self):
+        stat = os.stat(self.codes_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    params = np.load(self.params_path)
+                    self.quantizer = ScalarQuantizer(params) if self.mode == "int8" else ProductQuantizer(params)
+                    self.codes = np.load(self.codes_path, mmap_mode="r")
+                    self._signature = signature
+                    logger.info(f"Loaded {self.mode} codes for {self.codes.shape[0]} vectors")
+        return self
+
+    def search(self, query_embeddings, exact_vectors, top_k, candidates):
+        """Return a list of (rows, scores) per query, re-scored exactly and best first."""
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        approximate = self.quantizer.scores(self.codes, queries)
+        shortlist = top_k_indices(approximate, max(top_k, candidates))
+
+        results = []
+        for query, rows in zip(queries, shortlist):
+            # Sorted row order keeps the reads from the memory-mapped matrix sequential
+            rows = np.sort(rows)
+            exact = np.asarray(exact_vectors[rows], dtype=np.float32) @ query
+            best = top_k_indices(exact, top_k)
+            results.append((rows[best], exact[best]))
+        return results
+
+
+_quantized_indexes = {}
+_quantized_indexes_lock = threading.Lock()
+
+
+def get_quantized_index(model_name, mode):
+    """Return the process-wide quantized index of a mode for an embedding model's store."""
+    key = (model_name, mode)
+    with _quantized_indexes_lock:
+        if key not in _quantized_indexes:
+            _quantized_indexes[key] = QuantizedIndex(store_path_for_model(model_name), mode)
+        return _quantized_indexes[key]
@@ -0,0 +1,129 @@
+import os
+import re
+from typing import NamedTuple
+
+from .context_packer import CONTEXT_TOKEN_BUDGET
+
+__all__ = ['Route', 'route_query', 'system_prompt']
+
+# Fast tier for lookups and short answers; the strong tier only for comparisons and strategy
+FAST_MODEL = os.getenv("FAST_MODEL", "gpt-3.5-turbo")
+STRONG_MODEL = os.getenv("STRONG_MODEL", "gpt-4")
+
+# Keywords are matched as whole words, so "ros" does not fire on "prospects"
+ROOKIE_KEYWORDS = ['rookie', 'rookies', '2025 draft', 'first year']
+MATCHUP_KEYWORDS = [
+    "matchup", "matchups", "schedule", "season", "outlook", "ros", "rest of season",
+    "upcoming", "future", "games", "weeks", "look", "looking"
+]
+LINEUP_KEYWORDS = [
+    "lineup", "lineups", "draft", "drafting", "pick", "picks", "roster", "rosters",
+    "team", "teams", "start", "starting", "starters", "bench", "flex"
+]
+COMPARISON_PATTERN = r"\b(?:compare|comparison|vs\.?|versus|better|trade)\b"
+# "X or Y" / "X over Y" only counts between two names or two positions, so
+# "top 5 QBs over the next 3 weeks" stays a lookup
+NAME_CHOICE_PATTERN = r"\b[A-Z][\w.'-]*\s+(?:or|over)\s+[A-Z][\w.'-]*"
+POSITION_CHOICE_PATTERN = r"\b(?:qb|rb|wr|te|k|dst|def|flex)s?\s+(?:or|over)\s+(?:qb|rb|wr|te|k|dst|def|flex)s?\b"
+TOP_N_PATTERN = r"\btop\s+(\d{1,2})\b"
+# Prompt context per intent, as a share of CONTEXT_TOKEN_BUDGET (1500 by default)
+CONTEXT_SCALE = {
+    "comparison": 1.0,
+    "strategy": 4 / 3,
+    "rookie": 1.0,
+    "matchup": 0.8,
+    "lookup": 8 / 15,
+}
+MAX_TOP_K = 15
+
+
+class Route(NamedTuple):
+    """How a question is answered: model tier, retrieval depth, prompt and output length."""
+    intent: str
+    model: str
+    top_k: int
+    template: str
+    max_tokens: int
+    context_tokens: int
+
+
+ANALYST_PROMPT = """You are an expert fantasy football analyst providing advice.
+When analyzing players:
+1. Consider their current performance metrics and rankings
+2. Evaluate their upcoming matchups and strength of schedule
+3. Account for team situation, injuries, and offensive scheme
+4. Look at historical performance and trends
+5. Consider matchup-specific factors (e.g., home/away, defense vs. position)
+"""
+
+ROOKIE_PROMPT = """
+For rookie analysis specifically:
+1. Consider their draft position and college performance
+2. Evaluate their team's offensive scheme and opportunity
+3. Look at the depth chart and competition for targets/touches
+4. Consider the team's investment in the player
+5. Factor in their learning curve and NFL readiness
+"""
+
+ADVICE_PROMPT = """
+Provide clear, actionable advice with specific insights about:
+- Player's situation and outlook
+- Draft position and value
+- Opportunity and role
+- Relevant comparisons to established players
+
+Be direct and specific in your recommendations. If discussing rookies, acknowledge their rookie status and the uncertainty that comes with first-year players."""
+
+TEMPLATES = {
+    "lookup": """You are a fantasy football assistant. Answer the question directly and briefly from the rankings context.
+Quote ranks, positions, teams and matchups exactly as given. If the context does not contain the answer, say so.""",
+    "matchup": ANALYST_PROMPT + ADVICE_PROMPT,
+    "rookie": ANALYST_PROMPT + ROOKIE_PROMPT + ADVICE_PROMPT,
+    "comparison": ANALYST_PROMPT + ADVICE_PROMPT + """
+
+Compare the players side by side on the points above and finish with a clear recommendation.""",
+    "strategy": ANALYST_PROMPT + ROOKIE_PROMPT + ADVICE_PROMPT,
+}
+
+
+def system_prompt(template):
+    """System message for a route template."""
+    return TEMPLATES[template]
+
+
+def _context_tokens(intent):
+    return int(CONTEXT_TOKEN_BUDGET * CONTEXT_SCALE[intent])
+
+
+def _mentions(text, keywords):
+    return re.search(r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords) + r")\b", text) is not None
+
+
+def _is_comparison(query, text):
+    return bool(
+        re.search(COMPARISON_PATTERN, text)
+        or re.search(NAME_CHOICE_PATTERN, query)
+        or re.search(POSITION_CHOICE_PATTERN, text)
+    )
+
+
+def route_query(query):
+    """Pick model tier, top_k, prompt template and answer length for a question.
+
+    Intents are checked most expensive first: comparisons, then lineup and
+    draft strategy, then rookies and matchups. Anything else is a lookup.
+    """
+    text = query.lower()
+    top_n = re.search(TOP_N_PATTERN, text)
+    lookup_k = min(max(5, int(top_n.group(1))), MAX_TOP_K) if top_n else 5
+
+    if _is_comparison(query, text):
+        return Route("comparison", STRONG_MODEL, 5, "comparison", 800, _context_tokens("comparison"))
+    if _mentions(text, LINEUP_KEYWORDS):
+        return Route("strategy", STRONG_MODEL, 8, "strategy", 1000, _context_tokens("strategy"))
+    if _mentions(text, ROOKIE_KEYWORDS):
+        return Route("rookie", FAST_MODEL, max(8, lookup_k), "rookie", 700, _context_tokens("rookie"))
+    if _mentions(text, MATCHUP_KEYWORDS):
+        return Route("matchup", FAST_MODEL, lookup_k, "matchup", 600, _context_tokens("matchup"))
+    # Longer "top N" lists get room for one line per player
+    return Route("lookup", FAST_MODEL, lookup_k, "lookup", max(300, 40 * lookup_k), _context_tokens("lookup"))
@@ -0,0 +1,35 @@
+import numpy as np
+
+__all__ = ['top_k_indices', 'reciprocal_rank_fusion']
+
+
+def top_k_indices(scores, k):
+    """Return the indices of the k highest scores, best first.
+
+    Uses an O(n) partial selection and only sorts the k survivors. Works on a
+    1-D score vector or row-wise on a 2-D (num_queries, n) score matrix.
+    """
+    scores = np.asarray(scores)
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+    if k < n:
+        candidates = np.argpartition(scores, n - k, axis=-1)[..., n - k:]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=-1)
+    order = np.argsort(-candidate_scores, axis=-1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+def reciprocal_rank_fusion(rankings, top_k, k=60):
+    """Fuse several ranked row-id lists; returns (row_ids, fused_scores), best first."""
+    fused = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (k + rank + 1)
+    rows = np.fromiter(fused.keys(), dtype=np.intp, count=len(fused))
+    scores = np.fromiter(fused.values(), dtype=np.float32, count=len(fused))
+    best = top_k_indices(scores, top_k)
+    return rows[best], scores[best]
@@ -6,7 +6,24 @@ from pathlib import Path
 from dotenv import load_dotenv
 import numpy as np
 
-__all__ = ['search_index', 'get_openai_client']
+from .vector_index import get_vector_index
+from .ranking import top_k_indices, reciprocal_rank_fusion
+from .embedding_cache import get_embedding_cache, normalize_query
+from .embeddings import get_embedding_provider
+from .ann_index import get_ann_index
+from .quantization import get_quantized_index
+from .filters import infer_filters
+
+__all__ = [
+    'search_index',
+    'search_many',
+    'search_with_filters',
+    'infer_filters',
+    'resolve_players',
+    'link_sleeper_players',
+    'data_version',
+    'get_openai_client',
+]
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -36,50 +53,222 @@ try:
 except Exception as e:
     logger.error(f"Failed to set OpenAI API key at module level: {str(e)}")
 
-def search_index(query, top_k=5):
-    """Search for relevant context using OpenAI embeddings"""
+# "exact" scores every row with numpy; "flat", "ivf" or "hnsw" use a FAISS index
+# built by build_faiss_index.py, falling back to exact search if it is unavailable
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "exact").lower()
+# "int8" or "pq" scan quantized codes from build_quantized_index.py, then re-score
+# the best RESCORE_CANDIDATES rows exactly against the float32 vectors
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "none").lower()
+RESCORE_CANDIDATES = int(os.getenv("RESCORE_CANDIDATES", "50"))
+# Fuse BM25 over the embedding texts with the dense ranking
+HYBRID_SEARCH = os.getenv("HYBRID_SEARCH", "true").lower() in ("1", "true", "yes")
+FUSION_CANDIDATES = int(os.getenv("FUSION_CANDIDATES", "20"))
+# Questions that name players get those players' rows by id, with no embedding call
+ENTITY_LOOKUP = os.getenv("ENTITY_LOOKUP", "true").lower() in ("1", "true", "yes")
+# Inferred filters dropped one at a time when they match nothing; rookie goes first
+# because the rankings data often carries no rookie flag at all
+RELAX_ORDER = ("rookie", "position")
+
+def embed_queries(queries):
+    """Embed a list of queries, serving repeats from the query-embedding cache.
+
+    Only cache misses are sent to the configured embedding provider, all in a
+    single batch. Returns a (num_queries, dim) float32 matrix in input order.
+    """
+    provider = get_embedding_provider()
+    cache = get_embedding_cache(provider.model_name)
+    embeddings = [cache.get(query) for query in queries]
+
+    # Deduplicate misses so repeated questions in a batch are embedded once
+    missing = list(dict.fromkeys(
+        normalize_query(query) for query, embedding in zip(queries, embeddings) if embedding is None
+    ))
+    if missing:
+        fetched = dict(zip(missing, provider.embed(missing)))
+        for query, embedding in fetched.items():
+            cache.put(query, embedding)
+        embeddings = [
+            embedding if embedding is not None else fetched[normalize_query(query)]
+            for query, embedding in zip(queries, embeddings)
+        ]
+
+    return np.vstack(embeddings)
+
+def _dense_rank(model_name, index, query_embeddings, top_k, rows=None):
+    """Rank the corpus (or just the given rows) for each query embedding.
+
+    Returns one (row_ids, scores) pair per query, best first.
+    """
+    if rows is not None:
+        # Filtered searches score only the matching rows exactly; the subset is
+        # small, so the ANN and quantized paths would not save anything here
+        similarities = index.score_many(query_embeddings, rows)
+        top_indices = top_k_indices(similarities, top_k)
+        return [
+            (rows[row_indices], row_similarities[row_indices])
+            for row_indices, row_similarities in zip(top_indices, similarities)
+        ]
+
+    if VECTOR_INDEX_TYPE != "exact":
+        ann = get_ann_index(model_name, VECTOR_INDEX_TYPE)
+        if ann.available(index.store):
+            scores, row_ids = ann.refresh().search(query_embeddings, top_k)
+            return [(ids[ids >= 0], row_scores[ids >= 0]) for ids, row_scores in zip(row_ids, scores)]
+        logger.warning(f"{VECTOR_INDEX_TYPE} index unavailable or stale, falling back to exact search")
+
+    if VECTOR_QUANTIZATION != "none":
+        quantized = get_quantized_index(model_name, VECTOR_QUANTIZATION)
+        if quantized.available(index.store):
+            return quantized.refresh().search(query_embeddings, index.embeddings, top_k, RESCORE_CANDIDATES)
+        logger.warning(f"{VECTOR_QUANTIZATION} codes unavailable or stale, falling back to exact search")
+
+    # Calculate cosine similarities against the pre-normalized embeddings
+    similarities = index.score_many(query_embeddings)
+
+    # Get top k results without sorting the whole corpus
+    top_indices = top_k_indices(similarities, top_k)
+
+    return [
+        (row_indices, row_similarities[row_indices])
+        for row_indices, row_similarities in zip(top_indices, similarities)
+    ]
+
+def _direct_hits(index, query, rows=None):
+    """Rows of the players a query names, which need no dense pass; None if it names none."""
+    if ENTITY_LOOKUP:
+        return index.resolver.named_rows(query, rows)
+    return None
+
+def _rank(model_name, index, queries, top_k, rows=None):
+    """Rank rows for each query, fusing lexical and dense results when hybrid search is on.
+
+    Returns one (row_ids, scores) pair per query. Fused scores are reciprocal
+    rank fusion scores; named-player hits keep their match scores. Only
+    queries without direct hits are embedded.
+    """
+    direct = [_direct_hits(index, query, rows) for query in queries]
+    dense_queries = [query for query, hits in zip(queries, direct) if hits is None]
+    candidates = max(top_k, FUSION_CANDIDATES) if HYBRID_SEARCH else top_k
+    dense = iter(
+        _dense_rank(model_name, index, embed_queries(dense_queries), candidates, rows)
+        if dense_queries else []
+    )
+
+    ranked = []
+    for query, hits in zip(queries, direct):
+        if hits is not None:
+            ranked.append(hits)
+            continue
+        dense_rows, dense_scores = next(dense)
+        if not HYBRID_SEARCH:
+            ranked.append((dense_rows, dense_scores))
+            continue
+        lexical_rows, _ = index.lexical.search(query, candidates, rows)
+        ranked.append(reciprocal_rank_fusion([dense_rows, lexical_rows], top_k))
+    return ranked
+
+def search_index(query, top_k=5, position=None, team=None, rookie=None, ecr_range=None):
+    """Search for relevant context using the configured embedding provider.
+
+    Optional filters restrict the search to matching players: position and
+    team take a value or a list, rookie a bool, ecr_range an inclusive
+    (low, high) pair. infer_filters(query) derives them from the question.
+    """
     try:
-        import pickle
-        from pathlib import Path
-        import numpy as np
-        
-        # Use OpenAI embeddings instead of local model
-        response = openai.embeddings.create(
-            input=query,
-            model="text-embedding-ada-002"
-        )
-        query_embedding = np.array(response.data[0].embedding)
-        
-        # Load metadata and embeddings
-        data_dir = Path(__file__).parent.parent / "data"
-        metadata_path = data_dir / "fantasy_metadata.pkl"
-        embeddings_path = data_dir / "fantasy_embeddings.npy"
-        
-        if not metadata_path.exists() or not embeddings_path.exists():
+        provider = get_embedding_provider()
+        index = get_vector_index(provider.model_name)
+        if not index.exists():
             logger.error("Fantasy football data not found")
             st.error("Fantasy football data needs to be indexed first")
             return []
-            
-        # Load data
-        with open(metadata_path, "rb") as f:
-            metadata = pickle.load(f)
-        embeddings = np.load(embeddings_path)
-        
-        # Calculate similarities using dot product
-        similarities = np.dot(embeddings, query_embedding)
-        
-        # Get top k results
-        top_indices = np.argsort(similarities)[-top_k:][::-1]
-        
-        # Format results
-        results = []
-        for idx in top_indices:
-            result = metadata[idx]
-            result['score'] = float(similarities[idx])
-            results.append(result)
-            
-        return results
+
+        # Reuse the resident index; this only touches disk if the files changed
+        index.refresh()
+
+        # Resolve filters to row ids first; no matching rows means no embedding call
+        rows = index.attributes.rows(position=position, team=team, rookie=rookie, ecr_range=ecr_range)
+        if rows is not None and len(rows) == 0:
+            return []
+
+        # Queries are embedded with the configured provider (cached per normalized query)
+        row_ids, scores = _rank(provider.model_name, index, [query], top_k, rows)[0]
+        return [index.store.record(row, score) for row, score in zip(row_ids, scores)]
     except Exception as e:
         logger.error(f"Search error: {str(e)}")
         st.error(f"⚠️ Error during search: {str(e)}")
-        return []
\ No newline at end of file
+        return []
+
+def search_many(queries, top_k=5, position=None, team=None, rookie=None, ecr_range=None):
+    """Search for several queries at once.
+
+    All uncached queries that need a dense pass are embedded in a single
+    request and scored with one matrix multiply. Filters work as in
+    search_index and apply to every query.
+    Returns one result list per query, in input order.
+    """
+    queries = list(queries)
+    if not queries:
+        return []
+    try:
+        provider = get_embedding_provider()
+        index = get_vector_index(provider.model_name)
+        if not index.exists():
+            logger.error("Fantasy football data not found")
+            st.error("Fantasy football data needs to be indexed first")
+            return [[] for _ in queries]
+
+        index.refresh()
+        rows = index.attributes.rows(position=position, team=team, rookie=rookie, ecr_range=ecr_range)
+        if rows is not None and len(rows) == 0:
+            return [[] for _ in queries]
+
+        return [
+            [index.store.record(row, score) for row, score in zip(row_ids, scores)]
+            for row_ids, scores in _rank(provider.model_name, index, queries, top_k, rows)
+        ]
+    except Exception as e:
+        logger.error(f"Batch search error: {str(e)}")
+        st.error(f"⚠️ Error during search: {str(e)}")
+        return [[] for _ in queries]
+
+def search_with_filters(query, top_k=5):
+    """Search with the filters infer_filters(query) derives, relaxing them until something matches.
+
+    Filters are dropped one at a time in RELAX_ORDER, so "rookie WRs" keeps
+    the WR filter when no row is flagged as a rookie. The last resort is an
+    unfiltered search.
+    """
+    filters = infer_filters(query)
+    while filters:
+        results = search_index(query, top_k=top_k, **filters)
+        if results:
+            return results
+        dropped = next((name for name in RELAX_ORDER if name in filters), next(iter(filters)))
+        logger.info(f"No results with filters {filters}; dropping '{dropped}'")
+        filters = {name: value for name, value in filters.items() if name != dropped}
+    return search_index(query, top_k=top_k)
+
+def data_version():
+    """Identifier of the current rankings data build, or None if it has not been indexed."""
+    index = get_vector_index(get_embedding_provider().model_name)
+    if not index.exists():
+        return None
+    return index.refresh().version
+
+def resolve_players(query):
+    """Return the players named in a question (PlayerMatch tuples, in mention order)."""
+    try:
+        index = get_vector_index(get_embedding_provider().model_name)
+        if not index.exists():
+            return []
+        return index.refresh().resolver.resolve(query)
+    except Exception as e:
+        logger.error(f"Player resolution error: {str(e)}")
+        return []
+
+def link_sleeper_players(players):
+    """Let the name resolver map questions to Sleeper player ids as well.
+
+    players is the Sleeper /players/nfl mapping; passing the same dict again is a no-op.
+    """
+    get_vector_index(get_embedding_provider().model_name).link_sleeper_players(players)
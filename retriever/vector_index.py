@@ -0,0 +1,124 @@
+import os
+import logging
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .vector_store import VectorStore, MANIFEST_NAME, store_path_for_model
+from .filters import AttributeIndex
+from .lexical_index import BM25Index
+from .entity_resolver import EntityResolver
+from .ranking import top_k_indices
+
+__all__ = ['VectorIndex', 'get_vector_index', 'top_k_indices']
+
+logger = logging.getLogger(__name__)
+
+
+def _file_signature(path):
+    """Return a cheap fingerprint (mtime, size) used to detect file changes."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class VectorIndex:
+    """Long-lived, memory-mapped view of a vector store.
+
+    The store's matrix is row-normalized float32 on disk and is memory-mapped,
+    so queries only pay for a dot product. The index reopens the store when its
+    manifest changes, which happens last on every rebuild.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.store = None
+        self.embeddings = None
+        self.attributes = None
+        self.lexical = None
+        self.resolver = None
+        self.sleeper_players = None
+        self.version = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def exists(self):
+        """Check whether the vector store has been built."""
+        return VectorStore.exists(self.directory)
+
+    def refresh(self):
+        """Open the store on first use, or reopen it if it was rebuilt on disk."""
+        signature = _file_signature(self.directory / MANIFEST_NAME)
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._load(signature)
+        return self
+
+    def _load(self, signature):
+        store = VectorStore(self.directory)
+        attributes = AttributeIndex(store)
+        # BM25 over the same embedding texts the vectors were built from
+        lexical = BM25Index(store.columns["text"].tolist())
+        resolver = EntityResolver(store, self.sleeper_players)
+        self.store = store
+        self.embeddings = store.vectors
+        self.attributes = attributes
+        self.lexical = lexical
+        self.resolver = resolver
+        # Identifies the store's content; anything derived from it keys off this.
+        # Stores written before data_hash existed fall back to the manifest signature
+        data_hash = store.manifest.get("data_hash") or f"{signature[0]}:{signature[1]}"
+        self.version = f"{store.model}:{data_hash}"
+        self._signature = signature
+        logger.info(f"Loaded vector index with {len(store)} rows of dim {store.manifest['dim']}")
+
+    def link_sleeper_players(self, players):
+        """Add Sleeper full names to the name resolver; kept across store reloads.
+
+        A new resolver is built off to the side and swapped in with one
+        assignment, so concurrent searches never see it half-updated.
+        """
+        if players is self.sleeper_players:
+            return
+        with self._lock:
+            self.sleeper_players = players
+            store = self.store
+        if store is None:
+            return
+        resolver = EntityResolver(store, players)
+        with self._lock:
+            # A reload or a newer link in the meantime has already built its own resolver
+            if self.store is store and self.sleeper_players is players:
+                self.resolver = resolver
+
+    def score_many(self, query_embeddings, rows=None):
+        """Score a (num_queries, dim) matrix of query embeddings in one matrix multiply.
+
+        If rows is given, only those rows are scored and columns follow its order.
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.shape[-1] != self.embeddings.shape[1]:
+            raise ValueError(
+                f"Query embedding has dim {queries.shape[-1]}, index has dim {self.embeddings.shape[1]}"
+            )
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.maximum(norms, 1e-12)
+        embeddings = self.embeddings if rows is None else self.embeddings[rows]
+        return queries @ embeddings.T
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(model_name):
+    """Return the process-wide vector index for an embedding model.
+
+    Module state survives Streamlit reruns, so every query and every session in
+    this process shares the same memory-mapped matrix.
+    """
+    with _indexes_lock:
+        if model_name not in _indexes:
+            _indexes[model_name] = VectorIndex(store_path_for_model(model_name))
+        return _indexes[model_name]
@@ -0,0 +1,193 @@
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+__all__ = [
+    'PlayerRecord',
+    'VectorStore',
+    'BuildStamp',
+    'write_vector_store',
+    'write_build_stamp',
+    'store_path_for_model',
+]
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+STORE_ROOT = DATA_DIR / "vector_store"
+MANIFEST_NAME = "manifest.json"
+VECTORS_NAME = "vectors.npy"
+
+# Metadata columns stored as one .npy array each, with the dtype and missing value used on disk
+COLUMNS = {
+    "player_id": (np.int64, -1),
+    "player_name": (np.str_, ""),
+    "player_short_name": (np.str_, ""),
+    "position": (np.str_, ""),
+    "team": (np.str_, ""),
+    "opponent": (np.str_, ""),
+    "ecr_rank": (np.int32, -1),
+    "start_sit_grade": (np.str_, ""),
+    "pos_rank": (np.str_, ""),
+    "rookie": (np.int8, -1),
+}
+BOOL_COLUMNS = ("rookie",)
+TEXT_COLUMNS = ("text", "text_hash")
+
+
+class PlayerRecord(NamedTuple):
+    """Immutable search result row."""
+    player_id: Optional[int]
+    player_name: str
+    position: Optional[str]
+    team: Optional[str]
+    opponent: Optional[str]
+    ecr_rank: Optional[int]
+    start_sit_grade: Optional[str]
+    pos_rank: Optional[str]
+    rookie: Optional[bool] = None
+    player_short_name: Optional[str] = None
+    score: Optional[float] = None
+
+
+def store_path_for_model(model_name):
+    """Directory of the vector store built with a given embedding model."""
+    return STORE_ROOT / model_name.split("/")[-1]
+
+
+def _column_array(values, dtype, missing):
+    values = [missing if value is None else value for value in values]
+    if dtype is np.str_:
+        return np.array([str(value) for value in values], dtype=np.str_)
+    return np.array([int(value) for value in values], dtype=dtype)
+
+
+def _save_atomic(directory, name, array):
+    tmp_path = directory / f".{name}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, directory / name)
+
+
+def write_vector_store(directory, vectors, metadata, texts, text_hashes, model):
+    """Write vectors and metadata as a contiguous float32 matrix plus column arrays.
+
+    Vectors are row-normalized before writing so readers can score with a plain
+    dot product. The manifest is written last; readers key reloads off it.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    matrix = np.asarray(vectors, dtype=np.float32).reshape(len(metadata), -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = matrix / np.maximum(norms, 1e-12)
+    _save_atomic(directory, VECTORS_NAME, matrix)
+
+    for column, (dtype, missing) in COLUMNS.items():
+        _save_atomic(directory, f"{column}.npy", _column_array([m.get(column) for m in metadata], dtype, missing))
+    _save_atomic(directory, "text.npy", np.array(list(texts), dtype=np.str_))
+
+    text_hashes = list(text_hashes)
+    _save_atomic(directory, "text_hash.npy", np.array(text_hashes, dtype=np.str_))
+
+    manifest = {
+        "model": model,
+        "count": int(matrix.shape[0]),
+        "dim": int(matrix.shape[1]) if matrix.size else 0,
+        "columns": list(COLUMNS) + list(TEXT_COLUMNS),
+        # Changes only when some embedded text changes, unlike the file timestamps
+        "data_hash": hashlib.sha256("\n".join(text_hashes).encode("utf-8")).hexdigest(),
+    }
+    tmp_path = directory / f".{MANIFEST_NAME}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, directory / MANIFEST_NAME)
+    logger.info(f"Wrote vector store with {manifest['count']} rows to {directory}")
+    return manifest
+
+
+def _store_identity(manifest):
+    return {"data_hash": manifest.get("data_hash"), "count": manifest["count"]}
+
+
+def write_build_stamp(path, store):
+    """Record which store build an artifact derived from it (ANN index, codes) was built from."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(_store_identity(store.manifest), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class BuildStamp:
+    """Reads a stamp from write_build_stamp, reloading it only when the file changes."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.identity = None
+        self._signature = None
+
+    def matches(self, store):
+        """Check whether the artifact was built from this exact store build."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.identity = json.load(f)
+            except (OSError, ValueError):
+                self.identity = None
+            self._signature = signature
+        return self.identity == _store_identity(store.manifest)
+
+
+class VectorStore:
+    """Zero-copy, read-only view of a vector store directory.
+
+    The matrix and every column are memory-mapped, so opening a store costs a
+    few file mappings regardless of corpus size.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        with open(self.directory / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.vectors = np.load(self.directory / VECTORS_NAME, mmap_mode="r")
+        self.columns = {
+            column: np.load(self.directory / f"{column}.npy", mmap_mode="r")
+            for column in self.manifest["columns"]
+        }
+        count = self.manifest["count"]
+        if self.vectors.shape[0] != count or any(len(values) != count for values in self.columns.values()):
+            raise ValueError(f"Vector store at {self.directory} is incomplete or being rewritten")
+
+    def __len__(self):
+        return self.manifest["count"]
+
+    @property
+    def model(self):
+        return self.manifest["model"]
+
+    @staticmethod
+    def exists(directory):
+        return (Path(directory) / MANIFEST_NAME).exists()
+
+    def record(self, row, score=None):
+        """Build the immutable record for one row."""
+        values = {}
+        for column, (dtype, missing) in COLUMNS.items():
+            # Stores written before a column existed simply report it as missing
+            value = self.columns[column][row].item() if column in self.columns else missing
+            if value == missing:
+                values[column] = None
+            else:
+                values[column] = bool(value) if column in BOOL_COLUMNS else value
+        return PlayerRecord(score=None if score is None else float(score), **values)
@@ -1,79 +1,250 @@
+"""
+Vectorize the weekly rankings with the OpenAI embeddings API.
+
+Run from the project root with:  python -m retriever.vectorize_with_gpt4
+"""
+
+import hashlib
 import json
 import os
-import openai
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import openai
 from tqdm import tqdm
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
+from .tokens import count_tokens
+from .vector_store import VectorStore, write_vector_store, store_path_for_model
+
 # Set OpenAI API key from environment variable
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+EMBEDDING_MODEL = "text-embedding-ada-002"
+
 # File paths
 json_path = os.path.join(os.path.dirname(__file__), "..", "scrape", "data", "all_weekly_rankings.json")
-output_path = os.path.join(os.path.dirname(__file__), "..", "scrape", "data", "all_weekly_rankings_vectors.json")
+output_path = str(store_path_for_model(EMBEDDING_MODEL))
+# Request packing and concurrency limits
+MAX_BATCH_TOKENS = int(os.getenv("EMBED_BATCH_TOKENS", "8000"))
+MAX_BATCH_ITEMS = int(os.getenv("EMBED_BATCH_ITEMS", "256"))
+MAX_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+MAX_RETRIES = 5
+RETRY_DELAY = 2
 
-# Load the data
-with open(json_path, "r", encoding="utf-8") as f:
-    data = json.load(f)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
 
 # Function to build the input text for vectorization
+# Rookie rows from fantasypros_scraper.get_rookie_data use shorter field names,
+# so those are accepted as fallbacks; ranked rows produce the same text as before.
 def build_embedding_text(item):
+    position = item.get('player_positions', item.get('position'))
+    team = item.get('player_team_id', item.get('team'))
+    rank = item.get('rank_ecr', item.get('ecr_rank'))
+    matchup = f" against {item['player_opponent']}" if 'player_opponent' in item else ""
     return (
-        f"{item['player_name']} ({item['player_positions']} - {item['player_team_id']}) is ranked #{item['rank_ecr']} "
-        f"against {item['player_opponent']}. Start/sit grade: {item.get('start_sit_grade', 'N/A')}. "
+        f"{item['player_name']} ({position} - {team}) is ranked #{rank}"
+        f"{matchup}. Start/sit grade: {item.get('start_sit_grade', 'N/A')}. "
         f"Ownership: {item.get('player_owned_avg', 'N/A')}%. "
         f"Rank range: {item.get('rank_min')} to {item.get('rank_max')} (avg: {item.get('rank_ave')}). "
-        f"{item.get('note', '')} {item.get('recommendation', '')}".strip()
+        f"{item.get('note', item.get('notes', ''))} {item.get('recommendation', '')}".strip()
     )
 
-# Build list of texts and associated metadata
-texts_with_meta = []
-for item in data:
+def build_metadata(item):
+    return {
+        "player_id": item.get("player_id"),
+        "player_name": item["player_name"],
+        "player_short_name": item.get("player_short_name"),
+        "position": item.get("player_positions", item.get("position")),
+        "team": item.get("player_team_id", item.get("team")),
+        "opponent": item.get("player_opponent"),
+        "ecr_rank": item.get("rank_ecr", item.get("ecr_rank")),
+        "start_sit_grade": item.get("start_sit_grade"),
+        "pos_rank": item.get("pos_rank"),
+        "rookie": item.get("rookie"),
+    }
+
+def text_hash(text, model=EMBEDDING_MODEL):
+    """Content hash of an embedding input; the model is included so switching models re-embeds."""
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+def load_previous_vectors(output_path, model=EMBEDDING_MODEL):
+    """Map text hash -> vector from a previous run's vector store, if there is one."""
+    if not VectorStore.exists(output_path):
+        return {}
     try:
-        text = build_embedding_text(item)
-        if text:
-            texts_with_meta.append((text, item))
-    except Exception as e:
-        print(f"Error processing item {item.get('player_name')}: {e}")
-
-# Vectorize using OpenAI Embeddings API
-vectors = []
-for text, item in tqdm(texts_with_meta, desc="Vectorizing"):
-    success = False
-    while not success:
+        store = VectorStore(output_path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read previous vectors from {output_path}: {e}")
+        return {}
+    if store.model != model:
+        return {}
+    # Copy out of the memory map; the store files are replaced when the new store is written
+    vectors = np.array(store.vectors)
+    return {h: vectors[i] for i, h in enumerate(store.columns["text_hash"].tolist())}
+
+def pack_batches(texts, max_tokens=MAX_BATCH_TOKENS, max_items=MAX_BATCH_ITEMS, model=EMBEDDING_MODEL):
+    """Group text positions into request-sized batches, bounded by a token budget and item count."""
+    batches = []
+    current, current_tokens = [], 0
+    for i, text in enumerate(texts):
+        tokens = count_tokens(text, model)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+class EmbeddingStats:
+    """Thread-safe counters for a vectorization run."""
+
+    def __init__(self):
+        self.requests = 0
+        self.rate_limit_retries = 0
+        self.failed_batches = 0
+        self._lock = threading.Lock()
+
+    def add(self, field, amount=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+def _embed_batch(texts, model, stats):
+    """Embed one batch with jittered exponential backoff on transient errors."""
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            stats.add("requests")
+            response = openai.embeddings.create(input=texts, model=model)
+            vectors = [None] * len(texts)
+            for item in response.data:
+                vectors[item.index] = item.embedding
+            return vectors
+        except RETRYABLE_ERRORS as e:
+            if isinstance(e, openai.RateLimitError):
+                stats.add("rate_limit_retries")
+            if attempt == MAX_RETRIES:
+                raise
+            delay = RETRY_DELAY * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+            print(f"\n⏳ {type(e).__name__}, waiting {delay:.1f}s... (attempt {attempt}/{MAX_RETRIES})")
+            time.sleep(delay)
+
+def embed_texts(texts, model=EMBEDDING_MODEL, concurrency=MAX_CONCURRENCY, stats=None):
+    """Embed texts in packed batches with bounded concurrency.
+
+    Returns one vector per input text, in input order. Texts whose batch
+    failed after all retries get None.
+    """
+    stats = stats or EmbeddingStats()
+    batches = pack_batches(texts, model=model)
+    vectors = [None] * len(texts)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [
+            executor.submit(_embed_batch, [texts[i] for i in batch], model, stats)
+            for batch in batches
+        ]
+        with tqdm(total=len(texts), desc="Vectorizing") as progress:
+            # Collect in submission order so output order never depends on timing
+            for batch, future in zip(batches, futures):
+                try:
+                    for i, vector in zip(batch, future.result()):
+                        vectors[i] = vector
+                except openai.AuthenticationError:
+                    raise
+                except Exception as e:
+                    stats.add("failed_batches")
+                    print(f"\n❌ Embedding failed for a batch of {len(batch)} texts: {e}")
+                progress.update(len(batch))
+
+    return vectors
+
+def vectorize_data(json_path=json_path, output_path=output_path, model=EMBEDDING_MODEL,
+                   concurrency=MAX_CONCURRENCY, incremental=True):
+    """Embed the players in the rankings file and write the vector store.
+
+    With incremental=True, rows whose embedding text is unchanged since the
+    previous output reuse their stored vector; only new or changed rows are
+    sent to the API.
+    """
+    # Load the data
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    # Build list of texts and associated metadata
+    texts_with_meta = []
+    for item in data:
         try:
-            response = openai.embeddings.create(
-                input=text,
-                model="text-embedding-ada-002"  # or "text-embedding-3-large" if available
-            )
-            success = True
-        except openai.error.RateLimitError:
-            time.sleep(1)
+            text = build_embedding_text(item)
+            if text:
+                texts_with_meta.append((text, item))
         except Exception as e:
-            print(f"Embedding failed for {item['player_name']}: {e}")
-            break
-
-    if success:
-        vectors.append({
-            "text": text,
-            "vector": response.data[0].embedding,
-            "metadata": {
-                "player_id": item["player_id"],
-                "player_name": item["player_name"],
-                "position": item["player_positions"],
-                "team": item["player_team_id"],
-                "opponent": item["player_opponent"],
-                "ecr_rank": item["rank_ecr"],
-                "start_sit_grade": item.get("start_sit_grade"),
-                "pos_rank": item.get("pos_rank"),
-            }
-        })
-
-# Save vectors to file
-with open(output_path, "w", encoding="utf-8") as f:
-    json.dump(vectors, f, indent=2)
-
-print(f"✅ Saved {len(vectors)} vectors to {output_path}")
+            print(f"Error processing item {item.get('player_name')}: {e}")
+
+    hashes = [text_hash(text, model) for text, _ in texts_with_meta]
+    previous = load_previous_vectors(output_path, model) if incremental else {}
+    embeddings = [previous.get(h) for h in hashes]
+    reused = sum(vector is not None for vector in embeddings)
+
+    # Only new or changed texts are embedded (each distinct text once)
+    pending = list(dict.fromkeys(
+        (h, text) for h, (text, _), vector in zip(hashes, texts_with_meta, embeddings) if vector is None
+    ))
+    stats = EmbeddingStats()
+    if pending:
+        fetched = dict(zip(
+            [h for h, _ in pending],
+            embed_texts([text for _, text in pending], model, concurrency, stats)
+        ))
+        embeddings = [vector if vector is not None else fetched.get(h) for h, vector in zip(hashes, embeddings)]
+
+    rows = [
+        (text, h, vector, build_metadata(item))
+        for (text, item), h, vector in zip(texts_with_meta, hashes, embeddings)
+        if vector is not None
+    ]
+
+    print(f"\n📈 Embedding Statistics:")
+    print(f"Total items processed: {len(texts_with_meta)}")
+    print(f"Reused unchanged vectors: {reused}")
+    print(f"Newly embedded texts: {len(pending)}")
+    print(f"Successful embeddings: {len(rows)}")
+    print(f"Requests sent: {stats.requests}")
+    print(f"Rate limit retries: {stats.rate_limit_retries}")
+
+    # Save vectors as a float32 matrix plus metadata columns
+    manifest = write_vector_store(
+        output_path,
+        vectors=[vector for _, _, vector, _ in rows],
+        metadata=[metadata for _, _, _, metadata in rows],
+        texts=[text for text, _, _, _ in rows],
+        text_hashes=[h for _, h, _, _ in rows],
+        model=model
+    )
+
+    print(f"✅ Saved {manifest['count']} vectors to {output_path}")
+    return manifest
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vectorize the weekly rankings.")
+    parser.add_argument("--full", action="store_true", help="Re-embed every row instead of only changed ones")
+    args = parser.parse_args()
+    vectorize_data(incremental=not args.full)
+
+    # Warm the canned questions; a no-op when the rankings text did not change
+    from .precomputed_answers import precompute_answers
+    print(f"✅ Precomputed {precompute_answers()} answers")
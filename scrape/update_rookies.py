@@ -2,6 +2,7 @@ import json
 import os
 from fantasypros_scraper import get_rookie_data
 from vectorize_with_gpt4 import vectorize_data
+from retriever.precomputed_answers import precompute_answers
 
 def update_rookie_data():
     """Update the fantasy rankings data with rookie information."""
@@ -40,9 +41,13 @@ def update_rookie_data():
     with open(rankings_file, 'w') as f:
         json.dump(rankings_data, f, indent=2)
     
-    # Vectorize the updated data
+    # Vectorize the updated data; only new or changed rows are re-embedded
     print("Vectorizing updated data...")
-    vectorize_data(rankings_file)
+    vectorize_data(rankings_file, incremental=True)
+    
+    # Canned questions are re-answered only if the rankings text changed
+    print("Precomputing answers for the quick questions...")
+    precompute_answers()
     
     print("Rookie data update complete!")
 
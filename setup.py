@@ -13,6 +13,7 @@ setup(
         'numpy==1.26.4',  # Pre-built wheel available for Python 3.13
         'pandas==2.1.4',  # Compatible with numpy 1.26.4
         'scipy==1.11.4',  # Last stable version for this combination
-        'rich==13.7.0'
+        'rich==13.7.0',
+        'tiktoken==0.8.0'  # First release with Python 3.13 wheels
     ]
 )
\ No newline at end of file
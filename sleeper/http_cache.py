@@ -0,0 +1,179 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CACHE_DB_PATH = DATA_DIR / "sleeper_cache.sqlite"
+MEMORY_ENTRIES = int(os.getenv("SLEEPER_CACHE_MEMORY_ENTRIES", "256"))
+# Larger bodies (the multi-megabyte player map) are read from disk instead of held in every process
+MAX_MEMORY_BODY_BYTES = 256 * 1024
+
+# Seconds a response stays fresh, by endpoint path; first match wins
+ENDPOINT_TTLS = [
+    (r"^/players/nfl/trending/", 15 * 60),
+    (r"^/players/nfl$", 24 * 3600),  # Sleeper asks clients to fetch this at most once a day
+    (r"^/user/[^/]+$", 24 * 3600),
+    (r"^/user/[^/]+/leagues/", 3600),
+    (r"^/league/[^/]+/(?:matchups|transactions)/", 5 * 60),
+    (r"^/league/[^/]+/rosters$", 15 * 60),
+    (r"^/league/[^/]+(?:/users|/traded_picks)?$", 3600),
+    (r"^/draft/[^/]+(?:/picks)?$", 3600),
+]
+DEFAULT_TTL = 5 * 60
+
+
+def ttl_for(path: str) -> int:
+    """Freshness lifetime in seconds for an endpoint path such as /league/123/rosters."""
+    for pattern, ttl in ENDPOINT_TTLS:
+        if re.search(pattern, path):
+            return ttl
+    return DEFAULT_TTL
+
+
+class CachedResponse:
+    """The parts of a requests.Response that SleeperAPI uses, rebuilt from the cache."""
+
+    def __init__(self, status_code: int, content: bytes, headers: Optional[Dict] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def json(self):
+        # Parsed fresh on every call so callers can mutate the result freely
+        return json.loads(self.content)
+
+
+class _Entry:
+    __slots__ = ("content", "etag", "last_modified", "expires_at")
+
+    def __init__(self, content, etag, last_modified, expires_at):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires_at
+
+
+class HttpCache:
+    """Response cache for GET requests, keyed by path and query string.
+
+    A small in-memory LRU sits in front of a SQLite file that is shared across
+    processes and survives restarts. Stale entries keep their ETag and
+    Last-Modified validators so they can be revalidated with a conditional
+    request instead of downloaded again.
+    """
+
+    def __init__(self, db_path=CACHE_DB_PATH, memory_entries=MEMORY_ENTRIES):
+        self.db_path = Path(db_path)
+        self.memory_entries = memory_entries
+        self.logger = logging.getLogger(__name__)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, content BLOB NOT NULL, etag TEXT, "
+                "last_modified TEXT, expires_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key, entry):
+        if len(entry.content) > MAX_MEMORY_BODY_BYTES:
+            self._memory.pop(key, None)
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[_Entry]:
+        """Return the cached entry for a key, fresh or stale, or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                # Another process may have revalidated or invalidated it since
+                if entry.fresh:
+                    return entry
+            try:
+                row = self._connection().execute(
+                    "SELECT content, etag, last_modified, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Sleeper cache read failed: {str(e)}")
+                return entry
+            if row is None:
+                self._memory.pop(key, None)
+                return None
+            entry = _Entry(*row)
+            self._remember(key, entry)
+            return entry
+
+    def put(self, key: str, content: bytes, ttl: float, etag=None, last_modified=None):
+        """Store a response body with its validators."""
+        entry = _Entry(content, etag, last_modified, time.time() + ttl)
+        with self._lock:
+            self._remember(key, entry)
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, content, etag, last_modified, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, content, etag, last_modified, entry.expires_at)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Sleeper cache write failed: {str(e)}")
+        return entry
+
+    def refresh(self, key: str, entry: _Entry, ttl: float):
+        """Mark a revalidated (304 Not Modified) entry fresh again."""
+        return self.put(key, entry.content, ttl, entry.etag, entry.last_modified)
+
+    def invalidate(self, prefix: str = ""):
+        """Drop every entry whose key starts with prefix (all entries by default).
+
+        Other processes drop their in-memory copies once those expire.
+        """
+        with self._lock:
+            for key in [k for k in self._memory if k.startswith(prefix)]:
+                del self._memory[key]
+            try:
+                conn = self._connection()
+                # Escape LIKE wildcards so the prefix is matched literally
+                escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                conn.execute("DELETE FROM responses WHERE key LIKE ? ESCAPE '\\'", (escaped + "%",))
+                conn.commit()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Sleeper cache invalidation failed: {str(e)}")
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Return the process-wide Sleeper response cache."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = HttpCache()
+        return _shared_cache
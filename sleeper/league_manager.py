@@ -1,14 +1,74 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from .sleeper_api import SleeperAPI
+from .player_store import get_player_store
+
+# Upper bound on concurrent Sleeper requests per fan-out
+MAX_WORKERS = int(os.getenv("SLEEPER_MAX_WORKERS", "8"))
+# Resolved leagues kept in memory; the least recently used are dropped first
+RESOLVED_LEAGUES = 64
 
 class SleeperLeagueManager:
     def __init__(self):
         self.api = SleeperAPI()
         self.current_season = "2025"
-        self.all_players = None
+        self.logger = logging.getLogger(__name__)
+        # Shared per process and backed by a compact on-disk copy of /players/nfl
+        self.players = get_player_store(self.api)
+        self._resolved = OrderedDict()
+        self._resolved_lock = threading.Lock()
+
+    def get_user_league_summaries(self, username: str) -> Dict:
+        """List a user's leagues with only what the league selector needs.
+
+        Built from the per-season league lists alone, so the cost does not
+        grow with the number of leagues. Use get_league_details for the
+        rosters and draft of the league the user picks.
+        """
+        user = self.api.get_user(username)
+        if not user:
+            return {"error": f"User {username} not found"}
+
+        user_id = user["user_id"]
+        all_leagues = self.api.get_all_leagues_for_user(user_id)
+
+        return {
+            "username": username,
+            "user_id": user_id,
+            "leagues": [
+                self._league_summary(season, league)
+                for season, leagues in all_leagues.items()
+                for league in leagues
+            ]
+        }
+
+    def _league_summary(self, season: str, league: Dict) -> Dict:
+        return {
+            "season": season,
+            "league_name": league["name"],
+            "league_id": league["league_id"],
+            "total_rosters": league.get("total_rosters"),
+            "status": league.get("status"),
+            "draft_id": league.get("draft_id")
+        }
+
+    def get_league_details(self, league_id: str, user_id: str) -> Optional[Dict]:
+        """Roster, draft and scoring details for one league, or None if the user has no roster in it."""
+        league = self.api.get_league(league_id)
+        if not league:
+            return None
+        return self._league_info(league.get("season", self.current_season), league, user_id)
 
     def get_user_leagues_info(self, username: str) -> Dict:
-        """Get all relevant information for a user's leagues."""
+        """Get all relevant information for a user's leagues.
+
+        Loads details for every league; prefer get_user_league_summaries and
+        get_league_details when only one league will be looked at.
+        """
         user = self.api.get_user(username)
         if not user:
             return {"error": f"User {username} not found"}
@@ -16,44 +76,11 @@ class SleeperLeagueManager:
         user_id = user["user_id"]
         all_leagues = self.api.get_all_leagues_for_user(user_id)
         
-        leagues_info = []
-        for season, leagues in all_leagues.items():
-            for league in leagues:
-                league_id = league["league_id"]
-                rosters = self.api.get_league_rosters(league_id)
-                users = self.api.get_league_users(league_id)
-                
-                # Find user's roster
-                user_roster = next(
-                    (roster for roster in rosters if str(roster["owner_id"]) == str(user_id)),
-                    None
-                )
-
-                if user_roster:
-                    # Get draft information
-                    draft_id = league.get("draft_id")
-                    draft_info = None
-                    if draft_id:
-                        draft_info = self.api.get_draft(draft_id)
-                        draft_picks = self.api.get_draft_picks(draft_id)
-                        
-                        # Add draft pick information to roster
-                        user_picks = [
-                            pick for pick in draft_picks
-                            if str(pick.get("picked_by")) == str(user_id)
-                        ]
-                        user_roster["draft_picks"] = user_picks
-
-                    leagues_info.append({
-                        "season": season,
-                        "league_name": league["name"],
-                        "league_id": league_id,
-                        "total_rosters": len(rosters),
-                        "scoring_settings": league["scoring_settings"],
-                        "roster_positions": league["roster_positions"],
-                        "user_roster": user_roster,
-                        "draft_info": draft_info
-                    })
+        # Leagues are fetched concurrently; map() keeps season and league order
+        jobs = [(season, league) for season, leagues in all_leagues.items() for league in leagues]
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(jobs)))) as executor:
+            results = list(executor.map(lambda job: self._safe_league_info(job[0], job[1], user_id), jobs))
+        leagues_info = [info for info in results if info is not None]
 
         return {
             "username": username,
@@ -61,41 +88,120 @@ class SleeperLeagueManager:
             "leagues": leagues_info
         }
 
-    def get_roster_players(self, roster: Dict, include_draft_info: bool = True) -> List[Dict]:
-        """Convert roster player IDs to player information."""
-        if self.all_players is None:
-            self.all_players = self.api.get_all_players()
+    def _safe_league_info(self, season: str, league: Dict, user_id: str) -> Optional[Dict]:
+        """League info for one league; a failure is logged and skips just this league."""
+        try:
+            return self._league_info(season, league, user_id)
+        except Exception as e:
+            self.logger.error(f"Failed to load league {league.get('league_id')}: {str(e)}")
+            return None
 
-        players = []
-        for player_id in roster.get("players", []):
-            if player_id in self.all_players:
-                player = self.all_players[player_id].copy()
-                
-                # Add draft information if available
-                if include_draft_info and "draft_picks" in roster:
-                    draft_pick = next(
-                        (pick for pick in roster["draft_picks"] if pick["player_id"] == player_id),
-                        None
-                    )
-                    if draft_pick:
-                        player["draft_round"] = draft_pick["round"]
-                        player["draft_pick"] = draft_pick["pick_no"]
-
-                players.append({
-                    "player_id": player_id,
-                    "full_name": player.get("full_name"),
-                    "position": player.get("position"),
-                    "team": player.get("team"),
-                    "status": player.get("status"),
-                    "injury_status": player.get("injury_status"),
-                    "draft_info": {
-                        "round": player.get("draft_round"),
-                        "pick": player.get("draft_pick")
-                    } if "draft_round" in player else None
-                })
+    def _league_info(self, season: str, league: Dict, user_id: str) -> Optional[Dict]:
+        """Roster and draft details for one of the user's leagues, or None if they have no roster."""
+        league_id = league["league_id"]
+        rosters = self.api.get_league_rosters(league_id)
+        
+        # Find user's roster
+        user_roster = next(
+            (roster for roster in rosters if str(roster["owner_id"]) == str(user_id)),
+            None
+        )
+
+        if not user_roster:
+            return None
+
+        # Get draft information; picks are attached per player by resolve_league_rosters
+        draft_id = league.get("draft_id")
+        draft_info = self.api.get_draft(draft_id) if draft_id else None
+
+        return {
+            "season": season,
+            "league_name": league["name"],
+            "league_id": league_id,
+            "total_rosters": len(rosters),
+            "scoring_settings": league["scoring_settings"],
+            "roster_positions": league["roster_positions"],
+            "user_roster": user_roster,
+            "draft_info": draft_info
+        }
+
+    @staticmethod
+    def _pick_index(draft_picks: List[Dict]) -> Dict[str, Dict]:
+        """Index a draft's picks by player id, so each roster lookup is O(1)."""
+        return {str(pick["player_id"]): pick for pick in draft_picks or [] if pick.get("player_id")}
 
+    @staticmethod
+    def _roster_version(roster: Dict) -> tuple:
+        """Identifies a roster's contents; changes whenever a player is added or dropped."""
+        return (roster.get("roster_id"), roster.get("owner_id"), tuple(roster.get("players") or []))
+
+    def _memoized(self, key, build):
+        with self._resolved_lock:
+            if key in self._resolved:
+                self._resolved.move_to_end(key)
+                return self._resolved[key]
+        value = build()
+        with self._resolved_lock:
+            self._resolved[key] = value
+            while len(self._resolved) > RESOLVED_LEAGUES:
+                self._resolved.popitem(last=False)
+        return value
+
+    def _resolve_roster(self, roster: Dict, known_players: Dict[str, Dict], picks: Dict[str, Dict]) -> List[Dict]:
+        players = []
+        for player_id in roster.get("players") or []:
+            player = known_players.get(player_id)
+            if player is None:
+                continue
+            draft_pick = picks.get(player_id)
+            players.append({
+                "player_id": player_id,
+                "full_name": player.get("full_name"),
+                "position": player.get("position"),
+                "team": player.get("team"),
+                "status": player.get("status"),
+                "injury_status": player.get("injury_status"),
+                "draft_info": {
+                    "round": draft_pick["round"],
+                    "pick": draft_pick["pick_no"]
+                } if draft_pick else None
+            })
         return players
 
+    def get_roster_players(self, league_id: str, roster: Dict, include_draft_info: bool = True) -> List[Dict]:
+        """Convert a league roster's player IDs to player information.
+
+        Reads from resolve_league_rosters, so every view of a roster agrees on
+        draft info and repeated calls for one league cost a single resolution.
+        """
+        resolved = self.resolve_league_rosters(league_id, include_draft_info)
+        return resolved.get(str(roster.get("roster_id")), [])
+
+    def resolve_league_rosters(self, league_id: str, include_draft_info: bool = True) -> Dict[str, List[Dict]]:
+        """Resolve every roster in a league in one pass, as {roster_id: players}.
+
+        Draft info comes from an index over the league's whole draft, so a
+        player keeps the round they were drafted in even after a trade. All
+        rostered players are read from the player store in a single query.
+        Results are memoized per league and roster version.
+        """
+        league = self.api.get_league(league_id) or {}
+        rosters = self.api.get_league_rosters(league_id)
+        draft_id = league.get("draft_id") if include_draft_info else None
+        key = (self.players.version, league_id, draft_id, tuple(self._roster_version(roster) for roster in rosters))
+
+        def build():
+            picks = self._pick_index(self.api.get_draft_picks(draft_id)) if draft_id else {}
+            known_players = self.players.get_many(
+                {player_id for roster in rosters for player_id in roster.get("players") or []}
+            )
+            return {
+                str(roster["roster_id"]): self._resolve_roster(roster, known_players, picks)
+                for roster in rosters
+            }
+
+        return self._memoized(key, build)
+
     def get_keeper_recommendations(self, league_id: str, user_id: str) -> List[Dict]:
         """Get keeper recommendations based on draft position and current rankings."""
         rosters = self.api.get_league_rosters(league_id)
@@ -107,7 +213,7 @@ class SleeperLeagueManager:
         if not user_roster:
             return []
 
-        players = self.get_roster_players(user_roster, include_draft_info=True)
+        players = self.resolve_league_rosters(league_id).get(str(user_roster.get("roster_id")), [])
         
         # Sort players by value (current ranking vs draft position)
         keeper_options = []
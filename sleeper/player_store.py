@@ -0,0 +1,170 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+PLAYER_DB_PATH = DATA_DIR / "sleeper_players.sqlite"
+MAX_AGE_SECONDS = float(os.getenv("PLAYER_STORE_MAX_AGE", str(24 * 3600)))
+# After a failed refresh, wait this long before trying Sleeper again
+RETRY_SECONDS = 10 * 60
+
+# The only player fields the app reads; everything else in /players/nfl is dropped
+FIELDS = ("full_name", "position", "team", "status", "injury_status", "active")
+FANTASY_POSITIONS = ("QB", "RB", "WR", "TE", "K", "DEF")
+
+
+def _trim(player: Dict) -> tuple:
+    full_name = player.get("full_name")
+    if not full_name and player.get("first_name"):
+        # Team defenses have no full_name, only first_name/last_name ("Buffalo" "Bills")
+        full_name = f"{player['first_name']} {player.get('last_name', '')}".strip()
+    return (
+        full_name,
+        player.get("position"),
+        player.get("team"),
+        player.get("status"),
+        player.get("injury_status"),
+        None if player.get("active") is None else int(bool(player.get("active"))),
+    )
+
+
+class PlayerStore:
+    """Compact, on-disk copy of the Sleeper player map, indexed by player id.
+
+    Only the fields in FIELDS are kept, in a SQLite file shared by every
+    process. Lookups are primary-key queries, so no process holds the full
+    multi-megabyte player payload in memory. The copy is refreshed from
+    Sleeper at most once per MAX_AGE_SECONDS.
+    """
+
+    def __init__(self, api, db_path=PLAYER_DB_PATH, max_age: float = MAX_AGE_SECONDS):
+        self.api = api
+        self.db_path = Path(db_path)
+        self.max_age = max_age
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._refreshed_at = None
+        self._next_check = 0.0
+        self._fantasy_players = None
+
+    def _connection(self):
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS players ("
+                "player_id TEXT PRIMARY KEY, full_name TEXT, position TEXT, team TEXT, "
+                "status TEXT, injury_status TEXT, active INTEGER)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _stored_refresh_time(self, conn) -> Optional[float]:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+        return float(row[0]) if row else None
+
+    def _ensure_fresh(self):
+        """Refresh from Sleeper if the stored copy is missing or older than max_age."""
+        now = time.time()
+        if now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            conn = self._connection()
+            # Another process may already have refreshed the shared file
+            refreshed_at = self._stored_refresh_time(conn)
+            if refreshed_at is None or now - refreshed_at > self.max_age:
+                refreshed_at = self._refresh(conn) or refreshed_at
+            stale = refreshed_at is None or now - refreshed_at > self.max_age
+            self._next_check = now + RETRY_SECONDS if stale else refreshed_at + self.max_age
+            if refreshed_at != self._refreshed_at:
+                self._refreshed_at = refreshed_at
+                self._fantasy_players = None
+
+    def _refresh(self, conn) -> Optional[float]:
+        players = self.api.get_all_players()
+        if not players:
+            self.logger.error("Could not refresh the player store; keeping the existing copy")
+            return None
+        refreshed_at = time.time()
+        with conn:
+            conn.execute("DELETE FROM players")
+            conn.executemany(
+                "INSERT INTO players (player_id, full_name, position, team, status, injury_status, active) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((str(player_id), *_trim(player)) for player_id, player in players.items())
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('refreshed_at', ?)", (str(refreshed_at),)
+            )
+        self.logger.info(f"Refreshed player store with {len(players)} players")
+        return refreshed_at
+
+    @property
+    def version(self) -> Optional[float]:
+        """When the stored copy was last refreshed; changes whenever player data may have."""
+        self._ensure_fresh()
+        return self._refreshed_at
+
+    @staticmethod
+    def _row_dict(row) -> Dict:
+        player = dict(zip(FIELDS, row[1:]))
+        if player["active"] is not None:
+            player["active"] = bool(player["active"])
+        return player
+
+    def get(self, player_id: str) -> Optional[Dict]:
+        """Return the trimmed record of one player, or None."""
+        return self.get_many([player_id]).get(str(player_id))
+
+    def get_many(self, player_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Return {player_id: trimmed record} for the ids that exist, in one query."""
+        ids = [str(player_id) for player_id in player_ids]
+        if not ids:
+            return {}
+        self._ensure_fresh()
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT player_id, {', '.join(FIELDS)} FROM players WHERE player_id IN ({placeholders})", ids
+            ).fetchall()
+        return {row[0]: self._row_dict(row) for row in rows}
+
+    def fantasy_players(self) -> Dict[str, Dict]:
+        """Active players at fantasy positions, as {player_id: trimmed record}.
+
+        The same dict is returned until the store is next refreshed.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            if self._fantasy_players is None:
+                placeholders = ",".join("?" * len(FANTASY_POSITIONS))
+                rows = self._connection().execute(
+                    f"SELECT player_id, {', '.join(FIELDS)} FROM players "
+                    f"WHERE position IN ({placeholders}) AND COALESCE(active, 1) = 1",
+                    FANTASY_POSITIONS
+                ).fetchall()
+                self._fantasy_players = {row[0]: self._row_dict(row) for row in rows}
+            return self._fantasy_players
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_player_store(api, db_path=PLAYER_DB_PATH) -> PlayerStore:
+    """Return the process-wide player store for a database path."""
+    with _stores_lock:
+        key = str(db_path)
+        if key not in _stores:
+            _stores[key] = PlayerStore(api, db_path)
+        return _stores[key]
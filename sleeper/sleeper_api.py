@@ -1,17 +1,81 @@
+import os
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
+from urllib.parse import urlencode
 import logging
 
+from .http_cache import CachedResponse, get_http_cache, ttl_for
+from .transport import SleeperTransport
+
+# Cache GET responses on disk with per-endpoint TTLs (see http_cache.ENDPOINT_TTLS)
+HTTP_CACHE_ENABLED = os.getenv("SLEEPER_HTTP_CACHE", "true").lower() in ("1", "true", "yes")
+
 class SleeperAPI:
     BASE_URL = "https://api.sleeper.app/v1"
 
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, cache=None, transport=None):
+        # Timeouts, retries and the shared rate limit live in the transport
+        self.transport = transport or SleeperTransport()
+        self.session = self.transport.session
         self.logger = logging.getLogger(__name__)
+        self.cache = cache if cache is not None else (get_http_cache() if HTTP_CACHE_ENABLED else None)
+
+    def _get(self, path: str, params: Optional[Dict] = None):
+        """GET an endpoint path, served from the cache while fresh and revalidated once stale.
+
+        Returns a requests.Response or a CachedResponse; only 200 responses are cached.
+        """
+        if self.cache is None:
+            return self.transport.get(f"{self.BASE_URL}{path}", params=params)
+
+        key = f"{path}?{urlencode(sorted(params.items()))}" if params else path
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh:
+            return CachedResponse(200, entry.content)
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        try:
+            response = self.transport.get(f"{self.BASE_URL}{path}", params=params, headers=headers)
+        except requests.RequestException as e:
+            if entry is None:
+                raise
+            self.logger.warning(f"Serving stale {path} after request failure: {str(e)}")
+            return CachedResponse(200, entry.content)
+
+        ttl = ttl_for(path)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key, entry, ttl)
+            return CachedResponse(200, entry.content)
+        if response.status_code == 200:
+            self.cache.put(
+                key, response.content, ttl,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+        elif entry is not None and (response.status_code == 429 or response.status_code >= 500):
+            # The transport has already retried; an outage should not hide data we have
+            self.logger.warning(f"Serving stale {path} after Sleeper returned {response.status_code}")
+            return CachedResponse(200, entry.content)
+        return response
+
+    def stats(self) -> Dict:
+        """Request, retry, timeout and throttling counters for this process."""
+        return self.transport.stats.snapshot()
+
+    def invalidate(self, path_prefix: str = ""):
+        """Drop cached responses under a path, e.g. f"/league/{league_id}"; everything by default."""
+        if self.cache is not None:
+            self.cache.invalidate(path_prefix)
 
     def get_user(self, username: str) -> Optional[Dict]:
         """Get user information by username."""
-        response = self.session.get(f"{self.BASE_URL}/user/{username}")
+        response = self._get(f"/user/{username}")
         if response.status_code == 200:
             return response.json()
         self.logger.error(f"Failed to get user {username}: {response.status_code}")
@@ -19,25 +83,35 @@ class SleeperAPI:
 
     def get_user_leagues(self, user_id: str, season: str = "2025") -> List[Dict]:
         """Get all leagues for a user in a season."""
-        response = self.session.get(f"{self.BASE_URL}/user/{user_id}/leagues/nfl/{season}")
+        response = self._get(f"/user/{user_id}/leagues/nfl/{season}")
         if response.status_code == 200:
             return response.json()
         self.logger.error(f"Failed to get leagues for user {user_id}: {response.status_code}")
         return []
 
+    def _safe_user_leagues(self, user_id: str, season: str) -> List[Dict]:
+        """Leagues for one season; a failure is logged and skips just this season."""
+        try:
+            return self.get_user_leagues(user_id, season)
+        except Exception as e:
+            self.logger.error(f"Failed to get {season} leagues for user {user_id}: {str(e)}")
+            return []
+
     def get_all_leagues_for_user(self, user_id: str) -> Dict[str, List[Dict]]:
         """Get all leagues for a user across multiple seasons."""
         seasons = ["2023", "2024", "2025"]  # Add more seasons as needed
+        # One request per season, all in flight at once; results keep season order
+        with ThreadPoolExecutor(max_workers=len(seasons)) as executor:
+            season_leagues = list(executor.map(lambda season: self._safe_user_leagues(user_id, season), seasons))
         leagues_by_season = {}
-        for season in seasons:
-            leagues = self.get_user_leagues(user_id, season)
+        for season, leagues in zip(seasons, season_leagues):
             if leagues:
                 leagues_by_season[season] = leagues
         return leagues_by_season
 
     def get_league(self, league_id: str) -> Optional[Dict]:
         """Get league information."""
-        response = self.session.get(f"{self.BASE_URL}/league/{league_id}")
+        response = self._get(f"/league/{league_id}")
         if response.status_code == 200:
             return response.json()
         self.logger.error(f"Failed to get league {league_id}: {response.status_code}")
@@ -45,7 +119,7 @@ class SleeperAPI:
 
     def get_league_rosters(self, league_id: str) -> List[Dict]:
         """Get all rosters in a league."""
-        response = self.session.get(f"{self.BASE_URL}/league/{league_id}/rosters")
+        response = self._get(f"/league/{league_id}/rosters")
         if response.status_code == 200:
             return response.json()
         self.logger.error(f"Failed to get rosters for league {league_id}: {response.status_code}")
@@ -53,7 +127,7 @@ class SleeperAPI:
 
     def get_league_users(self, league_id: str) -> List[Dict]:
         """Get all users in a league."""
-        response = self.session.get(f"{self.BASE_URL}/league/{league_id}/users")
+        response = self._get(f"/league/{league_id}/users")
         if response.status_code == 200:
             return response.json()
         self.logger.error(f"Failed to get users for league {league_id}: {response.status_code}")
@@ -61,7 +135,7 @@ class SleeperAPI:
 
     def get_league_matchups(self, league_id: str, week: int) -> List[Dict]:
         """Get matchups for a specific week."""
-        response = self.session.get(f"{self.BASE_URL}/league/{league_id}/matchups/{week}")
+        response = self._get(f"/league/{league_id}/matchups/{week}")
         if response.status_code == 200:
             return response.json()
         self.logger.error(f"Failed to get matchups for league {league_id} week {week}: {response.status_code}")
@@ -69,7 +143,7 @@ class SleeperAPI:
 
     def get_league_transactions(self, league_id: str, week: int) -> List[Dict]:
         """Get transactions for a specific week."""
-        response = self.session.get(f"{self.BASE_URL}/league/{league_id}/transactions/{week}")
+        response = self._get(f"/league/{league_id}/transactions/{week}")
         if response.status_code == 200:
             return response.json()
         self.logger.error(f"Failed to get transactions for league {league_id} week {week}: {response.status_code}")
@@ -77,7 +151,7 @@ class SleeperAPI:
 
     def get_draft(self, draft_id: str) -> Optional[Dict]:
         """Get draft information."""
-        response = self.session.get(f"{self.BASE_URL}/draft/{draft_id}")
+        response = self._get(f"/draft/{draft_id}")
         if response.status_code == 200:
             return response.json()
         self.logger.error(f"Failed to get draft {draft_id}: {response.status_code}")
@@ -85,7 +159,7 @@ class SleeperAPI:
 
     def get_draft_picks(self, draft_id: str) -> List[Dict]:
         """Get all picks in a draft."""
-        response = self.session.get(f"{self.BASE_URL}/draft/{draft_id}/picks")
+        response = self._get(f"/draft/{draft_id}/picks")
         if response.status_code == 200:
             return response.json()
         self.logger.error(f"Failed to get picks for draft {draft_id}: {response.status_code}")
@@ -93,7 +167,7 @@ class SleeperAPI:
 
     def get_traded_picks(self, league_id: str) -> List[Dict]:
         """Get traded draft picks in a league."""
-        response = self.session.get(f"{self.BASE_URL}/league/{league_id}/traded_picks")
+        response = self._get(f"/league/{league_id}/traded_picks")
         if response.status_code == 200:
             return response.json()
         self.logger.error(f"Failed to get traded picks for league {league_id}: {response.status_code}")
@@ -101,7 +175,7 @@ class SleeperAPI:
 
     def get_all_players(self) -> Dict:
         """Get all NFL players."""
-        response = self.session.get(f"{self.BASE_URL}/players/nfl")
+        response = self._get("/players/nfl")
         if response.status_code == 200:
             return response.json()
         self.logger.error("Failed to get NFL players")
@@ -109,8 +183,8 @@ class SleeperAPI:
 
     def get_trending_players(self, type: str = "add", hours: int = 24, limit: int = 25) -> List[Dict]:
         """Get trending players (added/dropped)."""
-        response = self.session.get(
-            f"{self.BASE_URL}/players/nfl/trending/{type}",
+        response = self._get(
+            f"/players/nfl/trending/{type}",
             params={"lookback_hours": hours, "limit": limit}
         )
         if response.status_code == 200:
@@ -0,0 +1,137 @@
+import os
+import time
+import random
+import logging
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT = float(os.getenv("SLEEPER_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("SLEEPER_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("SLEEPER_MAX_RETRIES", "3"))
+# Sleeper asks clients to stay under 1000 requests per minute; keep some headroom
+RATE_LIMIT_PER_MINUTE = float(os.getenv("SLEEPER_RATE_LIMIT", "900"))
+RATE_LIMIT_BURST = int(os.getenv("SLEEPER_RATE_BURST", "50"))
+POOL_SIZE = int(os.getenv("SLEEPER_POOL_SIZE", "16"))
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a request may be sent."""
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping as needed. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class TransportStats:
+    """Counters for requests, retries and throttling, safe to update from many threads."""
+
+    FIELDS = ("requests", "retries", "timeouts", "server_errors", "throttled", "rate_limited", "rate_limit_wait_seconds")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {field: 0 for field in self.FIELDS}
+
+    def add(self, field: str, amount=1):
+        with self._lock:
+            self._counts[field] += amount
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+# One limiter and one set of counters per process; every SleeperAPI shares Sleeper's limit
+_shared_limiter = TokenBucket(RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BURST)
+_shared_stats = TransportStats()
+
+
+def _retry_after(response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return min(float(value), BACKOFF_MAX_SECONDS) if value is not None else None
+    except ValueError:
+        return None
+
+
+class SleeperTransport:
+    """HTTP GET with timeouts, jittered retries on 429/5xx and a shared rate limiter."""
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        max_retries: int = MAX_RETRIES,
+        limiter: Optional[TokenBucket] = None,
+        stats: Optional[TransportStats] = None,
+        pool_size: int = POOL_SIZE,
+    ):
+        self.session = session or requests.Session()
+        # Enough pooled connections for the concurrent league fan-out to reuse them
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = limiter or _shared_limiter
+        self.stats = stats or _shared_stats
+        self.logger = logging.getLogger(__name__)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: spreads retries from concurrent workers instead of synchronizing them
+        return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None):
+        """GET a URL, retrying timeouts, connection errors, 429 and 5xx responses."""
+        attempt = 0
+        while True:
+            waited = self.limiter.acquire()
+            if waited:
+                self.stats.add("rate_limited")
+                self.stats.add("rate_limit_wait_seconds", waited)
+            self.stats.add("requests")
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if isinstance(e, requests.Timeout):
+                    self.stats.add("timeouts")
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                self.logger.warning(f"Sleeper request failed ({type(e).__name__}), retrying in {delay:.2f}s: {url}")
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                self.stats.add("throttled" if response.status_code == 429 else "server_errors")
+                if attempt >= self.max_retries:
+                    return response
+                delay = _retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                self.logger.warning(f"Sleeper returned {response.status_code}, retrying in {delay:.2f}s: {url}")
+            self.stats.add("retries")
+            attempt += 1
+            time.sleep(delay)
@@ -27,8 +27,10 @@ project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
 try:
-    from retriever import search_index
-    from retriever.ask_rag import ask_rag
+    from retriever import search_with_filters, route_query
+    from retriever.ask_rag import ask_rag_stream
+    from retriever.canned_questions import QUICK_QUESTIONS
+    from retriever.precomputed_answers import get_precomputed_answer
     from sleeper.league_manager import SleeperLeagueManager
 except Exception as e:
     logger.error(f"Import error: {str(e)}")
@@ -36,6 +38,39 @@ except Exception as e:
     st.info("Please ensure all dependencies are installed")
     st.stop()
 
+def show_precomputed(question):
+    """Render a precomputed answer for a canned question; False if there is none."""
+    precomputed = get_precomputed_answer(question)
+    if not precomputed:
+        return False
+    st.write(precomputed["answer"])
+    st.success("Analysis Complete")
+    with st.expander("View Source Data"):
+        st.json(precomputed["sources"])
+    return True
+
+def answer_question(question):
+    """Answer a question in the current panel: precomputed if canned, otherwise retrieved and streamed."""
+    with st.spinner('Analyzing...'):
+        try:
+            # Canned questions are served from answers precomputed after the last data rebuild
+            if show_precomputed(question):
+                return
+            route = route_query(question)
+            context_chunks = search_with_filters(question, top_k=route.top_k)
+            if not context_chunks:
+                st.warning("No relevant information found.")
+                return
+            st.write_stream(ask_rag_stream(question, context_chunks, route))
+            st.success("Analysis Complete")
+
+            # Show source data in expander
+            with st.expander("View Source Data"):
+                st.json([chunk._asdict() for chunk in context_chunks])
+        except Exception as e:
+            logger.error(f"Error processing question: {str(e)}")
+            st.error(f"❌ Error: {str(e)}")
+
 # Page configuration
 st.set_page_config(
     page_title="Fantasy Football RAG Advisor",
@@ -79,52 +114,18 @@ with tab1:
     
     # Quick questions section
     st.subheader("Quick Questions")
-    example_questions = {
-        "Top Players": "Who are the top 5 QBs this week?",
-        "Start/Sit": "Should I start Josh Allen or Patrick Mahomes?",
-        "Rookies": "What rookie WRs should I target in the draft?",
-        "Waiver Wire": "Who are the best waiver wire pickups this week?"
-    }
+    example_questions = QUICK_QUESTIONS
     
     col1, col2 = st.columns(2)
     with col1:
         for label, question in list(example_questions.items())[:2]:
             if st.button(f"📋 {label}", key=f"btn_{label}"):
-                with st.spinner('Analyzing...'):
-                    try:
-                        context_chunks = search_index(question)
-                        if context_chunks:
-                            response = ask_rag(question, context_chunks)
-                            st.success("Analysis Complete")
-                            st.write(response)
-                            
-                            # Show source data in expander
-                            with st.expander("View Source Data"):
-                                st.json(context_chunks)
-                        else:
-                            st.warning("No relevant information found.")
-                    except Exception as e:
-                        logger.error(f"Error processing question: {str(e)}")
-                        st.error(f"❌ Error: {str(e)}")
+                answer_question(question)
 
     with col2:
         for label, question in list(example_questions.items())[2:]:
             if st.button(f"📋 {label}", key=f"btn_{label}"):
-                with st.spinner('Analyzing...'):
-                    try:
-                        context_chunks = search_index(question)
-                        if context_chunks:
-                            response = ask_rag(question, context_chunks)
-                            st.success("Analysis Complete")
-                            st.write(response)
-                            
-                            with st.expander("View Source Data"):
-                                st.json(context_chunks)
-                        else:
-                            st.warning("No relevant information found.")
-                    except Exception as e:
-                        logger.error(f"Error processing question: {str(e)}")
-                        st.error(f"❌ Error: {str(e)}")
+                answer_question(question)
 
     # Custom question section
     st.subheader("Ask Your Own Question")
@@ -133,21 +134,7 @@ with tab1:
         submit_button = st.form_submit_button(label='Get Analysis')
         
         if submit_button and question:
-            with st.spinner('Analyzing...'):
-                try:
-                    context_chunks = search_index(question)
-                    if context_chunks:
-                        response = ask_rag(question, context_chunks)
-                        st.success("Analysis Complete")
-                        st.write(response)
-                        
-                        with st.expander("View Source Data"):
-                            st.json(context_chunks)
-                    else:
-                        st.warning("No relevant information found.")
-                except Exception as e:
-                    logger.error(f"Error processing question: {str(e)}")
-                    st.error(f"❌ Error: {str(e)}")
+            answer_question(question)
 
 with tab2:
     st.header("Personal League Analysis")
@@ -159,13 +146,13 @@ with tab2:
         if submit_button and username:
             try:
                 league_manager = SleeperLeagueManager()
-                leagues_info = league_manager.get_user_leagues_info(username)
+                leagues_info = league_manager.get_user_league_summaries(username)
                 
                 if leagues_info and leagues_info.get("leagues"):
                     st.success(f"✅ Found {len(leagues_info['leagues'])} leagues")
                     
                     # League selector
-                    league_names = [league.get("name", "Unnamed League") 
+                    league_names = [league.get("league_name", "Unnamed League") 
                                   for league in leagues_info["leagues"]]
                     selected_league = st.selectbox("Select your league:", league_names)
                     